@@ -5,12 +5,19 @@ from __future__ import annotations
 import logging
 import os
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import async_get_integration
 
+from . import physics
+from .chart import async_setup_services
+from .coordinator import VirtualRoomCoordinator
+
 from .const import (
     DOMAIN,
     STORAGE_KEY,
@@ -27,11 +34,17 @@ from .const import (
     CONF_RADIANT_TYPE,
     CONF_IS_RADIANT,
     CONF_DEVICE_TYPE,
+    TYPE_AGGREGATOR,
     TYPE_ROOM,
     CONF_FLOOR_LEVEL,
     CONF_CALIBRATION_RH_SENSOR,
     CONF_PRECIPITATION_SENSOR,
     CONF_UV_INDEX_SENSOR,
+    CONF_SATURATION_FORMULA,
+    CONF_GLAZING,
+    CONF_ORIENTATION,
+    CONF_SOLAR_GAIN_SCALE,
+    ORIENTATION_DEGREES,
 )
 
 PLATFORMS: list[Platform] = [
@@ -44,6 +57,33 @@ PLATFORMS: list[Platform] = [
 
 _LOGGER = logging.getLogger(__name__)
 
+# Optional install-wide settings, e.g.
+# virtual_mrt_top:
+#   saturation_formula: hyland_wexler
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(
+                    CONF_SATURATION_FORMULA, default=physics.SVP_MAGNUS
+                ): vol.In(physics.SVP_FORMULAS),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Apply the install-wide settings from configuration.yaml."""
+    conf = config.get(DOMAIN) or {}
+    # Runs before any entry is set up, so no room has computed a state yet
+    physics.set_saturation_formula(
+        conf.get(CONF_SATURATION_FORMULA, physics.SVP_MAGNUS)
+    )
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Virtual MRT from a config entry."""
@@ -60,8 +100,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
             return False
 
+    # Rooms share one coordinator that owns all input subscriptions
+    coordinator = None
+    if entry.data.get(CONF_DEVICE_TYPE, TYPE_ROOM) != TYPE_AGGREGATOR:
+        coordinator = VirtualRoomCoordinator(hass, entry)
+        hass.data[DOMAIN][entry.entry_id] = coordinator
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Start after the platforms so the number/select controls are registered
+    if coordinator is not None:
+        coordinator.async_start()
+        entry.async_on_unload(coordinator.async_stop)
+
     # --- Register update listener with async_on_unload ---
     # entry.add_update_listener returns a callable that removes the listener.
     # entry.async_on_unload registers that callable to run when the entry unloads.
@@ -76,7 +127,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # --- CHANGED: Removed invalid 'remove_update_listener' call ---
     # The listener is now automatically removed by async_on_unload above.
 
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+    return unload_ok
 
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -126,8 +180,23 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         hass.config_entries.async_update_entry(entry, data=new_data, version=4)
         _LOGGER.info("Migration to version 4 successful for entry %s", entry.entry_id)
-        return True
 
+    # Handle V4 -> V5 (Solar term scales with the plane irradiance of the
+    # glazing instead of global horizontal radiation x azimuth incidence)
+    if entry.version == 4:
+        new_data = entry.data.copy()
+        if new_data.get(CONF_DEVICE_TYPE, TYPE_ROOM) == TYPE_ROOM and not new_data.get(
+            CONF_GLAZING
+        ):
+            # Keep calibrated k_solar values meaning the same annual gain
+            orientation = ORIENTATION_DEGREES.get(new_data.get(CONF_ORIENTATION), 180)
+            scale = await hass.async_add_executor_job(
+                physics.legacy_solar_gain_scale, orientation, hass.config.latitude
+            )
+            new_data[CONF_SOLAR_GAIN_SCALE] = round(scale, 3)
+
+        hass.config_entries.async_update_entry(entry, data=new_data, version=5)
+        _LOGGER.info("Migration to version 5 successful for entry %s", entry.entry_id)
 
     return True
 
@@ -0,0 +1,238 @@
+"""Psychrometric chart service for dashboards."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+
+from . import physics
+from .const import DOMAIN
+from .coordinator import VirtualRoomCoordinator
+
+SERVICE_PSYCHROMETRIC_CHART = "get_psychrometric_chart"
+ATTR_PRESSURE = "pressure"
+ATTR_T_MIN = "t_min"
+ATTR_T_MAX = "t_max"
+ATTR_STEP = "step"
+
+# Charts are built at the centre of pressure buckets of this width (hPa) and
+# cached per bucket, range and saturation formula
+CHART_PRESSURE_BUCKET = 5.0
+CHART_CACHE_SIZE = 16
+
+RH_LINES = (10, 20, 30, 40, 50, 60, 70, 80, 90)
+ENTHALPY_STEP = 10.0  # kJ/kg between enthalpy lines
+
+# ASHRAE 55 PMV comfort zones (|PMV| <= 0.5, T_mrt = T_air, still air) per
+# clothing level, up to the standard's humidity ratio limit
+COMFORT_ZONES = {"winter": 1.0, "summer": 0.5}
+COMFORT_MET = 1.1
+COMFORT_AIR_SPEED = 0.1
+COMFORT_PMV_LIMIT = 0.5
+COMFORT_MAX_HUMIDITY_RATIO = 12.0  # g/kg
+COMFORT_HUMIDITY_STEP = 2.0  # g/kg between polygon vertices
+
+CHART_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_PRESSURE): vol.All(
+            vol.Coerce(float), vol.Range(min=500.0, max=1100.0)
+        ),
+        vol.Optional(ATTR_T_MIN, default=-10.0): vol.All(
+            vol.Coerce(float), vol.Range(min=-40.0, max=50.0)
+        ),
+        vol.Optional(ATTR_T_MAX, default=40.0): vol.All(
+            vol.Coerce(float), vol.Range(min=-30.0, max=60.0)
+        ),
+        vol.Optional(ATTR_STEP, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=5.0)
+        ),
+    }
+)
+
+
+def _rounded(values: np.ndarray, digits: int = 3) -> list[float]:
+    return np.round(values, digits).tolist()
+
+
+def _relative_humidity(t_air: float, w: float, pressure: float) -> float:
+    """RH (%) of air at t_air with humidity ratio w (g/kg)."""
+    vp_actual = (w / 1000.0) * pressure / (0.622 + w / 1000.0)
+    return vp_actual / physics.Psychrometrics.calculate_vapor_pressure(t_air) * 100.0
+
+
+def _pmv_temperature(w: float, pressure: float, clo: float, target: float) -> float:
+    """Operative temperature where the PMV reaches target, by bisection."""
+    low, high = -10.0, 50.0
+    for _ in range(40):
+        mid = (low + high) / 2.0
+        pmv = physics.Psychrometrics.calculate_pmv(
+            mid,
+            mid,
+            COMFORT_AIR_SPEED,
+            _relative_humidity(mid, w, pressure),
+            COMFORT_MET,
+            clo,
+        )
+        if pmv < target:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2.0
+
+
+def comfort_zone(pressure: float, clo: float) -> list[list[float]]:
+    """Closed polygon [[T_op, W], ...] of the PMV comfort zone at this pressure."""
+    levels = np.arange(
+        0.0, COMFORT_MAX_HUMIDITY_RATIO + COMFORT_HUMIDITY_STEP / 2, COMFORT_HUMIDITY_STEP
+    )
+    cool = [
+        [_pmv_temperature(w, pressure, clo, -COMFORT_PMV_LIMIT), w] for w in levels
+    ]
+    warm = [[_pmv_temperature(w, pressure, clo, COMFORT_PMV_LIMIT), w] for w in levels]
+    polygon = cool + warm[::-1]
+    polygon.append(polygon[0])
+    return [[round(t, 2), round(float(w), 2)] for t, w in polygon]
+
+
+def _enthalpy_lines(
+    t: np.ndarray, w_sat: np.ndarray
+) -> list[dict[str, Any]]:
+    """Lines of constant enthalpy clipped to the chart (0 <= W <= saturation)."""
+    t_col = t[None, :]
+    h_min = 1.006 * t[0]
+    h_max = 1.006 * t[-1] + (w_sat[-1] / 1000.0) * (2501 + 1.86 * t[-1])
+    levels = np.arange(
+        np.ceil(h_min / ENTHALPY_STEP) * ENTHALPY_STEP, h_max, ENTHALPY_STEP
+    )
+    # W = (h - 1.006*T) / (2501 + 1.86*T), in g/kg, for every level at once
+    w = (levels[:, None] - 1.006 * t_col) / (2501 + 1.86 * t_col) * 1000.0
+    inside = (w >= 0) & (w <= w_sat[None, :])
+
+    lines = []
+    for level, row, mask in zip(levels, w, inside):
+        if np.count_nonzero(mask) < 2:
+            continue
+        lines.append(
+            {
+                "enthalpy": round(float(level), 1),
+                "temperature": _rounded(t[mask], 2),
+                "humidity_ratio": _rounded(row[mask]),
+            }
+        )
+    return lines
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def build_chart(
+    pressure: float, t_min: float, t_max: float, step: float, formula: str
+) -> dict[str, Any]:
+    """
+    Chart grids at one pressure (hPa), humidity ratios in g/kg. formula is
+    part of the cache key only (the selected saturation formula is used).
+
+    As on the ASHRAE 55 chart, the temperature axis is the operative
+    temperature: the comfort zones are in T_op, and the air property lines
+    are drawn for air at that temperature (T_air = T_mrt).
+    """
+    t = np.arange(t_min, t_max + step / 2, step)
+    vp_sat = physics.vapor_pressure(t)
+    w_sat = physics.humidity_ratio(vp_sat, pressure)
+    # Every RH line in one broadcast pass: (lines, temperatures)
+    rh = np.asarray(RH_LINES, dtype=float)[:, None]
+    w_rh = physics.humidity_ratio(vp_sat * rh / 100.0, pressure)
+
+    return {
+        "pressure": pressure,
+        "saturation_formula": formula,
+        "temperature": _rounded(t, 2),
+        "saturation": _rounded(w_sat),
+        "rh_lines": {
+            str(level): _rounded(row) for level, row in zip(RH_LINES, w_rh)
+        },
+        "enthalpy_lines": _enthalpy_lines(t, w_sat),
+        "comfort_zones": {
+            name: comfort_zone(pressure, clo) for name, clo in COMFORT_ZONES.items()
+        },
+    }
+
+
+def _room_points(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """
+    Current state point of every room, placed at its operative temperature
+    (the chart's temperature axis) and the humidity ratio of its air.
+    """
+    points = []
+    for entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+        if not isinstance(coordinator, VirtualRoomCoordinator):
+            continue
+        psy = coordinator.psychro
+        if psy is None:
+            continue
+        operative = (coordinator.data or {}).get("operative")
+        t_op = operative.native_value if operative else None
+        points.append(
+            {
+                "entry_id": entry_id,
+                "name": coordinator.name,
+                # Without T_op yet, fall back to the chart's T_air = T_mrt
+                "temperature": round(psy.t_air, 2) if t_op is None else t_op,
+                "air_temperature": round(psy.t_air, 2),
+                "relative_humidity": round(psy.rh, 1),
+                "humidity_ratio": round(psy.mixing_ratio, 3),
+                "enthalpy": round(psy.enthalpy, 2),
+                "pressure": psy.pressure,
+            }
+        )
+    return points
+
+
+def _default_pressure(hass: HomeAssistant, rooms: list[dict[str, Any]]) -> float:
+    """Mean station pressure of the rooms, else the ISA pressure at the home."""
+    if rooms:
+        return sum(room["pressure"] for room in rooms) / len(rooms)
+    elevation = hass.config.elevation or 0
+    return 1013.25 * (1 - 0.0000225577 * elevation) ** 5.25588
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the chart service (once per install)."""
+
+    async def handle_chart(call: ServiceCall) -> ServiceResponse:
+        t_min, t_max = call.data[ATTR_T_MIN], call.data[ATTR_T_MAX]
+        if t_max <= t_min:
+            raise HomeAssistantError("t_max must be above t_min")
+        rooms = _room_points(hass)
+        pressure = call.data.get(ATTR_PRESSURE) or _default_pressure(hass, rooms)
+        bucket = round(pressure / CHART_PRESSURE_BUCKET) * CHART_PRESSURE_BUCKET
+
+        # Building a chart takes a few PMV solves, keep it off the event loop
+        chart = await hass.async_add_executor_job(
+            build_chart,
+            bucket,
+            t_min,
+            t_max,
+            call.data[ATTR_STEP],
+            physics.saturation_formula(),
+        )
+        return {**chart, "rooms": rooms}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PSYCHROMETRIC_CHART,
+        handle_chart,
+        schema=CHART_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
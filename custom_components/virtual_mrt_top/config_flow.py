@@ -26,6 +26,8 @@ from .const import (
     CONF_WINDOW_STATE_SENSOR,
     CONF_DOOR_STATE_SENSOR,
     CONF_FAN_ENTITY,
+    CONF_OCCUPANCY_ENTITY,
+    CONF_ADAPTIVE_UPDATE,
     CONF_MANUAL_AIR_SPEED,
     CONF_SHADING_ENTITY,
     DEFAULT_ORIENTATION,
@@ -36,6 +38,10 @@ from .const import (
     CONF_PRESSURE_SENSOR,
     CONF_MIN_UPDATE_INTERVAL,
     DEFAULT_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_WAIT,
+    DEFAULT_MAX_UPDATE_WAIT,
+    CONF_PRIORITY_INPUTS,
+    PRIORITY_INPUT_OPTIONS,
     CONF_DEVICE_TYPE,
     TYPE_AGGREGATOR,
     TYPE_ROOM,
@@ -51,6 +57,7 @@ from .const import (
     CONF_WINDOW_AREA,
     CONF_WINDOW_U_VALUE,
     DEFAULT_WINDOW_U_VALUE,
+    CONF_GLAZING,
 )
 
 
@@ -74,7 +81,7 @@ def _flatten_input(user_input: dict) -> dict:
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Virtual MRT."""
 
-    VERSION = 4
+    VERSION = 5
     MINOR_VERSION = 0
 
     @staticmethod
@@ -297,6 +304,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                                         unit_of_measurement="W/m²K"
                                     )
                                 ),
+                                # List of {azimuth, tilt, area, shading}
+                                vol.Optional(CONF_GLAZING): selector.ObjectSelector(),
                             }
                         )
                     ),
@@ -359,6 +368,44 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                                         ]
                                     )
                                 ),
+                                vol.Optional(
+                                    CONF_OCCUPANCY_ENTITY
+                                ): selector.EntitySelector(
+                                    selector.EntitySelectorConfig(
+                                        domain=[
+                                            Platform.BINARY_SENSOR,
+                                            "input_boolean",
+                                            "person",
+                                            "device_tracker",
+                                        ]
+                                    )
+                                ),
+                                vol.Optional(
+                                    CONF_PRIORITY_INPUTS,
+                                    default=PRIORITY_INPUT_OPTIONS,
+                                ): selector.SelectSelector(
+                                    selector.SelectSelectorConfig(
+                                        options=PRIORITY_INPUT_OPTIONS,
+                                        multiple=True,
+                                        mode=SelectSelectorMode.LIST,
+                                        translation_key="priority_inputs",
+                                    )
+                                ),
+                                vol.Optional(
+                                    CONF_ADAPTIVE_UPDATE, default=False
+                                ): selector.BooleanSelector(),
+                                vol.Optional(
+                                    CONF_MAX_UPDATE_WAIT,
+                                    default=DEFAULT_MAX_UPDATE_WAIT,
+                                ): selector.NumberSelector(
+                                    selector.NumberSelectorConfig(
+                                        min=0,
+                                        max=900,
+                                        step=5,
+                                        unit_of_measurement="seconds",
+                                        mode=selector.NumberSelectorMode.BOX,
+                                    )
+                                ),
                             }
                         )
                     ),
@@ -464,6 +511,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             "manual_air_speed", CONF_MANUAL_AIR_SPEED, DEFAULT_AIR_SPEED_STILL
         )
         shading = _get_data("shading_entity", CONF_SHADING_ENTITY)
+        occupancy = self.config_entry.data.get(CONF_OCCUPANCY_ENTITY)
 
         is_radiant = _get_data("is_radiant_heating", CONF_IS_RADIANT, False)
         cal_rh_sensor = _get_data("calibration_rh_sensor", CONF_CALIBRATION_RH_SENSOR)  # <--- NEW
@@ -478,11 +526,19 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         min_interval = _get_data(
             "min_update_interval", CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
         )
+        max_wait = self.config_entry.data.get(
+            CONF_MAX_UPDATE_WAIT, DEFAULT_MAX_UPDATE_WAIT
+        )
+        adaptive = self.config_entry.data.get(CONF_ADAPTIVE_UPDATE, False)
+        priority_inputs = self.config_entry.data.get(
+            CONF_PRIORITY_INPUTS, PRIORITY_INPUT_OPTIONS
+        )
         room_area = _get_data("room_area", CONF_ROOM_AREA, 15.0)
         floor = _get_data("floor_level", CONF_FLOOR_LEVEL, 1)
         gross_wall = self.config_entry.data.get(CONF_EXTERIOR_WALL_AREA)
         win_area = self.config_entry.data.get(CONF_WINDOW_AREA, 0.0)
         win_u = self.config_entry.data.get(CONF_WINDOW_U_VALUE, DEFAULT_WINDOW_U_VALUE)
+        glazing = self.config_entry.data.get(CONF_GLAZING)
 
         schema = {
             # --- CORE ---
@@ -639,6 +695,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                                 unit_of_measurement="W/m²K"
                             )
                         ),
+                        vol.Optional(
+                            CONF_GLAZING,
+                            description={"suggested_value": glazing}
+                        ): selector.ObjectSelector(),
                     }
                 )
             ),
@@ -697,6 +757,43 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                                 ]
                             )
                         ),
+                        vol.Optional(
+                            CONF_OCCUPANCY_ENTITY,
+                            description={"suggested_value": occupancy},
+                        ): selector.EntitySelector(
+                            selector.EntitySelectorConfig(
+                                domain=[
+                                    Platform.BINARY_SENSOR,
+                                    "input_boolean",
+                                    "person",
+                                    "device_tracker",
+                                ]
+                            )
+                        ),
+                        vol.Optional(
+                            CONF_PRIORITY_INPUTS, default=priority_inputs
+                        ): selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=PRIORITY_INPUT_OPTIONS,
+                                multiple=True,
+                                mode=SelectSelectorMode.LIST,
+                                translation_key="priority_inputs",
+                            )
+                        ),
+                        vol.Optional(
+                            CONF_ADAPTIVE_UPDATE, default=adaptive
+                        ): selector.BooleanSelector(),
+                        vol.Optional(
+                            CONF_MAX_UPDATE_WAIT, default=max_wait
+                        ): selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=0,
+                                max=900,
+                                step=5,
+                                unit_of_measurement="seconds",
+                                mode=selector.NumberSelectorMode.BOX,
+                            )
+                        ),
                     }
                 )
             ),
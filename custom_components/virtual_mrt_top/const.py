@@ -4,6 +4,17 @@ from typing import Iterable
 
 DOMAIN = "virtual_mrt_top"
 
+# hass.data[DOMAIN] keys of the shared services (other keys are entry IDs)
+DATA_ENGINE = "engine"
+DATA_EPHEMERIS = "ephemeris"
+DATA_FORECAST = "forecast"
+DATA_OUTDOOR = "outdoor"
+DATA_STATE_INDEX = "state_index"
+DATA_STATE_PARSER = "state_parser"
+
+# configuration.yaml option (install-wide): saturation vapour pressure formula
+CONF_SATURATION_FORMULA = "saturation_formula"
+
 STORAGE_KEY = f"{DOMAIN}_profiles"
 STORAGE_VERSION = 1
 STORE_KEY_CUSTOM = "custom"
@@ -14,8 +25,11 @@ CONF_EXTERIOR_WALL_AREA = "exterior_wall_area"  # Gross area (Wall + Window)
 CONF_WINDOW_AREA = "window_area"                # Glass area
 CONF_WINDOW_U_VALUE = "window_u_value"          # Insulation metric for glass
 DEFAULT_WINDOW_U_VALUE = 2.0
+CONF_GLAZING = "glazing"                        # List of windows/skylights
+DEFAULT_GLAZING_TILT = 90.0                     # Vertical window
 CONF_ROOM_PROFILE = "room_profile"
 CONF_ORIENTATION = "orientation"
+CONF_SOLAR_GAIN_SCALE = "solar_gain_scale"      # k_solar scale set by the v5 migration
 CONF_AIR_TEMP_SOURCE = "air_temp_source"
 CONF_WEATHER_ENTITY = "weather_entity"
 CONF_SOLAR_SENSOR = "solar_sensor"
@@ -45,6 +59,28 @@ CONF_METABOLISM = "metabolism"
 CUSTOM_PROFILE_KEY = "custom"
 CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
 DEFAULT_MIN_UPDATE_INTERVAL = 30  # Seconds
+CONF_MAX_UPDATE_WAIT = "max_update_wait"
+DEFAULT_MAX_UPDATE_WAIT = 120  # Seconds
+CONF_PRIORITY_INPUTS = "priority_inputs"
+# Inputs whose changes bypass the rate limiter (ventilation and HVAC events)
+PRIORITY_INPUT_OPTIONS = ["window", "door", "fan", "climate"]
+CONF_ADAPTIVE_UPDATE = "adaptive_update"
+# Adaptive mode: the update interval follows the rate of change of T_op so it
+# moves about ADAPTIVE_UPDATE_STEP between updates, within floor and ceiling
+ADAPTIVE_UPDATE_FLOOR = 10  # Seconds
+ADAPTIVE_UPDATE_CEILING = 300  # Seconds
+ADAPTIVE_UPDATE_STEP = 0.1  # °C
+CONF_OCCUPANCY_ENTITY = "occupancy_entity"
+# While the room is unoccupied the model updates at most this often, and the
+# comfort-only outputs (PMV, perception, humidex) are refreshed on this heartbeat
+UNOCCUPIED_UPDATE_INTERVAL = 300  # Seconds
+UNOCCUPIED_COMFORT_INTERVAL = 1800  # Seconds
+# Attribute-only changes are written at most this often
+ATTRIBUTE_REFRESH_INTERVAL = 300  # Seconds
+# Mold growth index: VTT sensitivity class of the coldest surface, and the
+# longest gap between updates integrated with the last known conditions
+MOLD_INDEX_SENSITIVITY = "sensitive"
+MOLD_INDEX_MAX_STEP = 3600  # Seconds
 CONF_DEVICE_TYPE = "device_type"
 TYPE_ROOM = "room"
 TYPE_AGGREGATOR = "aggregator"
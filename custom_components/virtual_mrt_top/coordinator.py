@@ -0,0 +1,1825 @@
+"""Per-room update coordinator for Virtual MRT."""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from . import physics
+from .const import (
+    DOMAIN,
+    CONF_AIR_TEMP_SOURCE,
+    CONF_WEATHER_ENTITY,
+    CONF_ROOM_PROFILE,
+    CONF_ORIENTATION,
+    CONF_SOLAR_SENSOR,
+    ROOM_PROFILES,
+    CONF_THERMAL_ALPHA,
+    CONF_IS_RADIANT,
+    CONF_SOLAR_GAIN_SCALE,
+    CONF_CLIMATE_ENTITY,
+    CONF_WINDOW_STATE_SENSOR,
+    CONF_DOOR_STATE_SENSOR,
+    CONF_FAN_ENTITY,
+    CONF_MANUAL_AIR_SPEED,
+    CONF_HVAC_AIR_SPEED,
+    DEFAULT_AIR_SPEED_STILL,
+    DEFAULT_AIR_SPEED_HVAC,
+    DEFAULT_AIR_SPEED_WINDOW,
+    DEFAULT_AIR_SPEED_DOOR,
+    FAN_SPEED_MAP,
+    CONF_SHADING_ENTITY,
+    RADIANT_TYPES,
+    CONF_RADIANT_SURFACE_TEMP,
+    CONF_RADIANT_TYPE,
+    ORIENTATION_DEGREES,
+    CONF_RH_SENSOR,
+    CONF_WALL_SURFACE_SENSOR,
+    CONF_WIND_SPEED_SENSOR,
+    CONF_OUTDOOR_TEMP_SENSOR,
+    CONF_OUTDOOR_HUMIDITY_SENSOR,
+    CONF_PRESSURE_SENSOR,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_WAIT,
+    DEFAULT_MAX_UPDATE_WAIT,
+    CONF_PRIORITY_INPUTS,
+    PRIORITY_INPUT_OPTIONS,
+    CONF_ROOM_AREA,
+    DEFAULT_ROOM_AREA,
+    CONF_FLOOR_LEVEL,
+    CONF_CALIBRATION_RH_SENSOR,
+    CONF_PRECIPITATION_SENSOR,
+    CONF_UV_INDEX_SENSOR,
+    CONF_CLOTHING_INSULATION,
+    CONF_METABOLISM,
+    CONF_EXTERIOR_WALL_AREA,
+    CONF_WINDOW_AREA,
+    CONF_WINDOW_U_VALUE,
+    DEFAULT_WINDOW_U_VALUE,
+    CONF_GLAZING,
+    CONF_OCCUPANCY_ENTITY,
+    CONF_ADAPTIVE_UPDATE,
+    ADAPTIVE_UPDATE_CEILING,
+    ADAPTIVE_UPDATE_FLOOR,
+    ADAPTIVE_UPDATE_STEP,
+    MOLD_INDEX_MAX_STEP,
+    MOLD_INDEX_SENSITIVITY,
+    UNOCCUPIED_COMFORT_INTERVAL,
+    UNOCCUPIED_UPDATE_INTERVAL,
+    DEFAULT_GLAZING_TILT,
+)
+from .engine import async_get_engine
+from .forecast import WeatherForecast, async_get_forecast
+from .outdoor import (
+    OUTDOOR_AIR,
+    OUTDOOR_PRESSURE,
+    OUTDOOR_SKY,
+    OUTDOOR_SUN,
+    OutdoorHub,
+    OutdoorSources,
+    async_get_outdoor_hub,
+)
+from .tracking import async_get_state_index
+from .units import (
+    INVALID_STATES,
+    KIND_TEMPERATURE,
+    SENSOR_ATTRIBUTES,
+    async_get_state_parser,
+)
+from .physics import Psychrometrics
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sibling controls (unique_id suffix -> platform) the MRT model cannot run without
+REQUIRED_SIBLINGS = {
+    "f_out": "number",
+    "f_win": "number",
+    "k_loss": "number",
+    "k_solar": "number",
+    "profile": "select",
+    CONF_THERMAL_ALPHA: "number",
+    CONF_MANUAL_AIR_SPEED: "number",
+    CONF_HVAC_AIR_SPEED: "number",
+}
+# Only created (and required) when the room has radiant heating
+RADIANT_SIBLINGS = {
+    CONF_RADIANT_SURFACE_TEMP: "number",
+    CONF_RADIANT_TYPE: "select",
+}
+# Nice to have, the PMV model falls back to defaults without them
+OPTIONAL_SIBLINGS = {
+    CONF_CLOTHING_INSULATION: "number",
+    CONF_METABOLISM: "number",
+}
+
+# Intermediate terms of the room model. Each tracked entity marks the terms it
+# feeds as dirty, and an update only re-reads and re-derives those terms.
+TERM_AIR = "air"
+TERM_HUMIDITY = "humidity"
+TERM_PRESSURE = "pressure"
+TERM_OUTDOOR = "outdoor"
+TERM_RADIATION = "radiation"
+TERM_SUN = "sun"
+TERM_AIRFLOW = "airflow"
+TERM_SHADING = "shading"
+TERM_FACTORS = "factors"
+TERM_RADIANT = "radiant"
+TERM_COMFORT = "comfort"
+TERM_SURFACE = "surface"
+TERM_OCCUPANCY = "occupancy"
+ALL_TERMS = frozenset(
+    {
+        TERM_AIR,
+        TERM_HUMIDITY,
+        TERM_PRESSURE,
+        TERM_OUTDOOR,
+        TERM_RADIATION,
+        TERM_SUN,
+        TERM_AIRFLOW,
+        TERM_SHADING,
+        TERM_FACTORS,
+        TERM_RADIANT,
+        TERM_COMFORT,
+        TERM_SURFACE,
+        TERM_OCCUPANCY,
+    }
+)
+# Attributes read from climate and cover inputs; other attribute changes
+# (current_temperature, target temperature, tilt, ...) do not trigger updates
+CLIMATE_ATTRIBUTES = frozenset({"hvac_action", "fan_mode"})
+COVER_ATTRIBUTES = frozenset({"current_position"})
+# Terms the MRT (and so T_op) depends on
+MRT_TERMS = frozenset(
+    {
+        TERM_AIR,
+        TERM_OUTDOOR,
+        TERM_RADIATION,
+        TERM_SUN,
+        TERM_AIRFLOW,
+        TERM_SHADING,
+        TERM_FACTORS,
+        TERM_RADIANT,
+    }
+)
+_PSYCHRO_TERMS = frozenset({TERM_AIR, TERM_HUMIDITY, TERM_PRESSURE})
+# Output (unique_id suffix) -> terms it depends on; others keep their last result
+OUTPUT_TERMS = {
+    "operative": MRT_TERMS,
+    "dew_point": _PSYCHRO_TERMS,
+    "frost_point": _PSYCHRO_TERMS,
+    "abs_humidity": _PSYCHRO_TERMS,
+    "enthalpy": _PSYCHRO_TERMS | {TERM_OUTDOOR},
+    "humidex": _PSYCHRO_TERMS,
+    "perception": _PSYCHRO_TERMS,
+    "mold_risk": _PSYCHRO_TERMS | {TERM_OUTDOOR, TERM_FACTORS, TERM_SURFACE},
+    "heat_flux": _PSYCHRO_TERMS
+    | {TERM_OUTDOOR, TERM_FACTORS, TERM_SURFACE, TERM_AIRFLOW},
+    "moisture_excess": _PSYCHRO_TERMS | {TERM_OUTDOOR},
+    "pmv": MRT_TERMS | {TERM_HUMIDITY, TERM_COMFORT},
+    "calibration_k": frozenset(
+        {TERM_AIR, TERM_HUMIDITY, TERM_OUTDOOR, TERM_SUN, TERM_SURFACE}
+    ),
+}
+# Outputs only relevant to someone in the room; frozen while it is unoccupied
+# and refreshed every UNOCCUPIED_COMFORT_INTERVAL
+COMFORT_OUTPUTS = frozenset({"pmv", "perception", "humidex"})
+# States of the occupancy entity meaning nobody is in the room (anything else,
+# including unavailable, counts as occupied)
+UNOCCUPIED_STATES = frozenset({"off", "not_home"})
+# Share of the gap closed per update when the rate of change of T_op falls;
+# a rise is followed at once
+ADAPTIVE_RATE_DECAY = 0.3
+# Outdoor hub part -> term it feeds
+OUTDOOR_PART_TERMS = {
+    OUTDOOR_AIR: TERM_OUTDOOR,
+    OUTDOOR_PRESSURE: TERM_PRESSURE,
+    OUTDOOR_SKY: TERM_RADIATION,
+    OUTDOOR_SUN: TERM_SUN,
+}
+# Sibling control -> term it feeds
+SIBLING_TERMS = {
+    "f_out": TERM_FACTORS,
+    "f_win": TERM_FACTORS,
+    "k_loss": TERM_FACTORS,
+    "k_solar": TERM_FACTORS,
+    "profile": TERM_FACTORS,
+    CONF_THERMAL_ALPHA: TERM_FACTORS,
+    CONF_MANUAL_AIR_SPEED: TERM_AIRFLOW,
+    CONF_HVAC_AIR_SPEED: TERM_AIRFLOW,
+    CONF_RADIANT_SURFACE_TEMP: TERM_RADIANT,
+    CONF_RADIANT_TYPE: TERM_RADIANT,
+    CONF_CLOTHING_INSULATION: TERM_COMFORT,
+    CONF_METABOLISM: TERM_COMFORT,
+}
+
+
+def _parse_glazing(raw: Any) -> tuple[physics.GlazingElement, ...]:
+    """
+    Glazing elements from the config: a list of mappings with azimuth
+    (degrees or a compass point), tilt, area and shading. Invalid elements are
+    logged and skipped.
+    """
+    elements: list[physics.GlazingElement] = []
+    for item in raw or ():
+        try:
+            azimuth = item["azimuth"]
+            if isinstance(azimuth, str) and azimuth.upper() in ORIENTATION_DEGREES:
+                azimuth = ORIENTATION_DEGREES[azimuth.upper()]
+            element = physics.GlazingElement(
+                azimuth=float(azimuth) % 360.0,
+                tilt=float(item.get("tilt", DEFAULT_GLAZING_TILT)),
+                area=float(item.get("area", 1.0)),
+                shading=item.get("shading") or None,
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            _LOGGER.warning("Ignoring invalid glazing element: %s", item)
+            continue
+        if element.area <= 0 or not 0.0 <= element.tilt <= 180.0:
+            _LOGGER.warning("Ignoring invalid glazing element: %s", item)
+            continue
+        elements.append(element)
+    return tuple(elements)
+
+
+@dataclass
+class RoomInputs:
+    """One typed snapshot of every input the room model reads."""
+
+    t_air: float | None = None
+    rh: float | None = None
+    pressure: float = 1013.25
+    t_out: float | None = None
+    rh_out: float | None = None
+    outdoor_source: str = "dedicated_sensors"
+    wind_ms: float = 0.0
+    t_out_eff: float | None = None
+    outdoor_attrs: dict[str, Any] = field(default_factory=dict)
+    h_out: float | None = None
+    w_out: float | None = None
+    irradiance: physics.Irradiance = physics.Irradiance(0.0, 0.0, 0.0)
+    radiation_attrs: dict[str, Any] = field(default_factory=dict)
+    sun_azimuth: float | None = None
+    sun_elevation: float | None = None
+    sun_up: bool = False
+    hvac_action: str | None = None
+    fan_mode: str | None = None
+    window_open: bool = False
+    door_open: bool = False
+    fan_state: str | None = None
+    shading: float = 1.0
+    glazing_shading: tuple[float, ...] = ()
+    profile: str = ""
+    f_out: float = 0.0
+    f_win: float = 0.0
+    k_loss: float = 0.0
+    k_solar: float = 0.0
+    alpha: float = 0.3
+    manual_speed: float = 0.0
+    hvac_speed: float = DEFAULT_AIR_SPEED_HVAC
+    radiant_temp: float = 24.0
+    radiant_type: str = "high_mass"
+    wall_temp: float | None = None
+    surface_rh: float | None = None
+    clo: float = 0.6
+    met: float = 1.1
+    occupied: bool = True
+
+
+@dataclass
+class SensorResult:
+    """The state, attributes and (optional) icon computed for one room entity."""
+
+    native_value: Any
+    attributes: dict[str, Any] = field(default_factory=dict)
+    icon: str | None = None
+
+
+class VirtualRoomCoordinator(DataUpdateCoordinator[dict[str, SensorResult]]):
+    """
+    Owns every input subscription of a room.
+
+    A state change marks the model terms fed by that entity as dirty. The next
+    update re-reads and re-derives only those terms, reuses the cached values
+    for the rest, and pushes the results to all sibling sensor entities.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        super().__init__(hass, _LOGGER, name=entry.data.get("name", entry.entry_id))
+        self._entry = entry
+        self._config = entry.data
+
+        # Inputs
+        self.entity_air = self._config[CONF_AIR_TEMP_SOURCE]
+        self.entity_weather = self._config[CONF_WEATHER_ENTITY]
+        self.entity_rh = self._config.get(CONF_RH_SENSOR)
+        self.entity_pressure = self._config.get(CONF_PRESSURE_SENSOR)
+        self.entity_solar = self._config.get(CONF_SOLAR_SENSOR)
+        self.entity_climate = self._config.get(CONF_CLIMATE_ENTITY)
+        self.entity_fan = self._config.get(CONF_FAN_ENTITY)
+        self.entity_window = self._config.get(CONF_WINDOW_STATE_SENSOR)
+        self.entity_door = self._config.get(CONF_DOOR_STATE_SENSOR)
+        self.entity_shading = self._config.get(CONF_SHADING_ENTITY)
+        self.entity_wall_sensor = self._config.get(CONF_WALL_SURFACE_SENSOR)
+        self.entity_cal_rh = self._config.get(CONF_CALIBRATION_RH_SENSOR)
+        self.entity_outdoor_temp = self._config.get(CONF_OUTDOOR_TEMP_SENSOR)
+        self.entity_outdoor_hum = self._config.get(CONF_OUTDOOR_HUMIDITY_SENSOR)
+        self.entity_wind_speed = self._config.get(CONF_WIND_SPEED_SENSOR)
+        self.entity_rain = self._config.get(CONF_PRECIPITATION_SENSOR)
+        self.entity_uv = self._config.get(CONF_UV_INDEX_SENSOR)
+        self.entity_occupancy = self._config.get(CONF_OCCUPANCY_ENTITY)
+
+        self.is_radiant = self._config.get(CONF_IS_RADIANT, False)
+        # k_solar calibrated on the pre-v5 solar term (see async_migrate_entry)
+        self.solar_gain_scale = self._config.get(CONF_SOLAR_GAIN_SCALE, 1.0)
+        self.orientation_degrees = ORIENTATION_DEGREES.get(
+            self._config[CONF_ORIENTATION], 180
+        )
+        self.room_area = self._config.get(CONF_ROOM_AREA, DEFAULT_ROOM_AREA)
+        self.floor_level = self._config.get(CONF_FLOOR_LEVEL, 1)
+        self.wall_area_gross = self._config.get(CONF_EXTERIOR_WALL_AREA)
+        self.glazing = _parse_glazing(self._config.get(CONF_GLAZING))
+        self.window_area = self._config.get(CONF_WINDOW_AREA, 0.0)
+        if not self.window_area and self.glazing:
+            self.window_area = sum(element.area for element in self.glazing)
+        self.window_u = self._config.get(CONF_WINDOW_U_VALUE, DEFAULT_WINDOW_U_VALUE)
+
+        # Sibling entity IDs (number/select controls), resolved from the registry
+        self.sibling_ids: dict[str, str | None] = {}
+
+        # Filter state carried between model runs (the MRT EMA lives in the engine)
+        self._radiant_boost_stored = 0.0
+        self._radiant_boost_time: float | None = None
+
+        # Latest inputs and derived terms, refreshed per dirty term
+        self._inputs = RoomInputs()
+        self._terms: dict[str, Any] = {}
+        self._input_terms: dict[str, frozenset[str]] = {}
+        # Input states as delivered by the state change events
+        self._states: dict[str, State | None] = {}
+        self._parser = async_get_state_parser(hass)
+        self._dirty_terms: set[str] = set(ALL_TERMS)
+        self._stale_terms: set[str] = set(ALL_TERMS)
+        self._plan: dict[str, tuple[Callable[[], None], ...]] = {}
+
+        # The MRT itself is evaluated by the domain-wide engine
+        self._engine = async_get_engine(hass)
+        self._pending: tuple[RoomInputs, dict[str, Any], set[str]] | None = None
+
+        # Weather, outdoor sensors and the sun are shared by every room that
+        # uses the same sources, and derived once per change. The hub is taken
+        # in async_start: one without listeners is dropped from hass.data.
+        self._outdoor_sources = OutdoorSources(
+            self.entity_weather,
+            self.entity_outdoor_temp,
+            self.entity_outdoor_hum,
+            self.entity_wind_speed,
+            self.entity_pressure,
+            self.entity_uv,
+            self.entity_rain,
+            self.entity_solar,
+        )
+        self._outdoor: OutdoorHub | None = None
+        self._unsub_outdoor = None
+
+        # Hourly forecast of the weather entity (shared), projected per refresh.
+        # Taken in async_start, like the outdoor hub.
+        self._forecast: WeatherForecast | None = None
+        self._unsub_forecast = None
+        self._projection: SensorResult | None = None
+        # Shared by every psychrometric output, recomputed when T, RH or P change
+        self._psychro: physics.PsychroState | None = None
+        # VTT mold index, advanced on every update with RH and restored by its
+        # sensor (rooms without an RH sensor have no mold index entity)
+        self._mold_sensitivity = physics.MOLD_SENSITIVITY_CLASSES[
+            MOLD_INDEX_SENSITIVITY
+        ]
+        self._mold_index = 0.0
+        self._mold_unfavourable = 0.0
+        # (time, surface temperature, surface RH) of the last step
+        self._mold_sample: tuple[float, float, float] | None = None
+
+        self._min_update_interval = self._config.get(CONF_MIN_UPDATE_INTERVAL, 30.0)
+        self._max_update_wait = self._config.get(
+            CONF_MAX_UPDATE_WAIT, DEFAULT_MAX_UPDATE_WAIT
+        )
+        # Adaptive mode replaces the fixed interval (starts fast, see
+        # _adapt_update_interval)
+        self._adaptive = self._config.get(CONF_ADAPTIVE_UPDATE, False)
+        self._update_interval = (
+            ADAPTIVE_UPDATE_FLOOR if self._adaptive else self._min_update_interval
+        )
+        self._rate_sample: tuple[float, float] | None = None
+        self._output_rate = 0.0
+        priority = self._config.get(CONF_PRIORITY_INPUTS, PRIORITY_INPUT_OPTIONS)
+        self._priority_entities = {
+            entity_id
+            for key, entity_id in (
+                ("window", self.entity_window),
+                ("door", self.entity_door),
+                ("fan", self.entity_fan),
+                ("climate", self.entity_climate),
+            )
+            if entity_id and key in priority
+        }
+        # Comfort outputs are recomputed as soon as someone enters the room
+        if self.entity_occupancy:
+            self._priority_entities.add(self.entity_occupancy)
+        self._last_update_time = 0.0
+        self._scheduled_update_time: float | None = None
+        # Terms changed since the comfort outputs were last computed
+        self._comfort_time = 0.0
+        self._comfort_dirty: set[str] = set()
+        self._cancel_scheduled_update = None
+        self._state_index = async_get_state_index(hass)
+        self._unsub_tracker = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    @callback
+    def async_start(self) -> None:
+        """Resolve sibling controls, subscribe to every input and run once."""
+        self._resolve_sibling_ids()
+        self._outdoor = async_get_outdoor_hub(self.hass, self._outdoor_sources)
+        self._forecast = async_get_forecast(self.hass, self.entity_weather)
+        self._engine.async_register(
+            self._entry.entry_id,
+            self.orientation_degrees,
+            self._handle_engine_result,
+            self.glazing,
+        )
+
+        self._plan = self._compile_plan()
+        self._input_terms = self._build_input_terms()
+        tracked = self._tracked_entities()
+        self._states = {
+            entity_id: self.hass.states.get(entity_id) for entity_id in tracked
+        }
+        self._unsub_tracker = self._state_index.async_subscribe(
+            {
+                entity_id: self._input_terms.get(entity_id, ALL_TERMS)
+                for entity_id in tracked
+            },
+            self._handle_state_change,
+            self._build_input_attributes(),
+        )
+        self._unsub_outdoor = self._outdoor.async_add_listener(
+            self._handle_outdoor_update
+        )
+        self._unsub_forecast = self._forecast.async_add_listener(
+            self._handle_forecast_update
+        )
+        self._perform_update()
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop all subscriptions and pending timers."""
+        self._engine.async_unregister(self._entry.entry_id)
+        self._pending = None
+        if self._unsub_tracker:
+            self._unsub_tracker()
+            self._unsub_tracker = None
+        if self._unsub_outdoor:
+            self._unsub_outdoor()
+            self._unsub_outdoor = None
+        if self._unsub_forecast:
+            self._unsub_forecast()
+            self._unsub_forecast = None
+        if self._cancel_scheduled_update:
+            self._cancel_scheduled_update()
+            self._cancel_scheduled_update = None
+            self._scheduled_update_time = None
+
+    @property
+    def mold_index_state(self) -> tuple[float, float]:
+        """(index, unfavourable hours) of the integrator, saved across restarts."""
+        return self._mold_index, self._mold_unfavourable
+
+    @callback
+    def async_restore_mold_index(self, index: float, unfavourable: float) -> None:
+        """Continue the mold index from the integrator saved before a restart."""
+        self._mold_index = min(max(index, 0.0), physics.MOLD_INDEX_MAX)
+        self._mold_unfavourable = max(unfavourable, 0.0)
+        if self.data and "mold_index" in self.data:
+            self.data["mold_index"] = self._mold_index_result()
+
+    @property
+    def psychro(self) -> physics.PsychroState | None:
+        """Psychrometric state of the room air at the last update."""
+        return self._psychro
+
+    def _resolve_sibling_ids(self) -> bool:
+        """Look up the entity IDs of this room's number/select controls."""
+        registry = er.async_get(self.hass)
+        wanted = {**REQUIRED_SIBLINGS, **OPTIONAL_SIBLINGS}
+        if self.is_radiant:
+            wanted.update(RADIANT_SIBLINGS)
+
+        for key, platform in wanted.items():
+            if not self.sibling_ids.get(key):
+                self.sibling_ids[key] = registry.async_get_entity_id(
+                    platform, DOMAIN, f"{self._entry.entry_id}_{key}"
+                )
+        return self._siblings_ready()
+
+    def _siblings_ready(self) -> bool:
+        required = list(REQUIRED_SIBLINGS)
+        if self.is_radiant:
+            required.extend(RADIANT_SIBLINGS)
+        return all(self.sibling_ids.get(key) for key in required)
+
+    def _tracked_entities(self) -> list[str]:
+        """Every room-specific entity feeding the outputs (outdoor ones go via the hub)."""
+        entities = [self.entity_air]
+        for entity_id in (
+            self.entity_rh,
+            self.entity_wall_sensor,
+            self.entity_cal_rh,
+            self.entity_climate,
+            self.entity_fan,
+            self.entity_window,
+            self.entity_door,
+            self.entity_shading,
+            *(element.shading for element in self.glazing),
+            self.entity_occupancy,
+            *self.sibling_ids.values(),
+        ):
+            if entity_id and entity_id not in entities:
+                entities.append(entity_id)
+        return entities
+
+    # ------------------------------------------------------------------
+    # Rate limiting
+    # ------------------------------------------------------------------
+    @callback
+    def _handle_state_change(
+        self, entity_id: str, new_state: State | None, terms: frozenset[str]
+    ) -> None:
+        """
+        Handle input state changes with Rate Limiting.
+
+        - Priority inputs (window, door, fan, climate, occupancy) update
+          immediately.
+        - Other inputs update immediately if the last update is at least
+          min_update_interval old (leading edge); otherwise a single trailing
+          update is scheduled for the end of the interval.
+        - Outdoor changes (weather, outdoor sensors, sun; see
+          _handle_outdoor_update) are batched: they update at once if the
+          last update is at least max_update_wait old, otherwise they are
+          folded into whichever update runs first, and never deferred past
+          max_update_wait after the last update.
+        - In adaptive mode min_update_interval is replaced by an interval
+          following the rate of change of T_op (see _adapt_update_interval),
+          which also caps max_update_wait for batched changes.
+        - While the room is unoccupied, the interval is raised to
+          UNOCCUPIED_UPDATE_INTERVAL.
+        """
+        self._states[entity_id] = new_state
+        self._dirty_terms.update(terms)
+        self._schedule_update(
+            priority=entity_id in self._priority_entities, batched=False
+        )
+
+    @callback
+    def _handle_outdoor_update(self, parts: frozenset[str]) -> None:
+        """The shared outdoor hub derived new conditions."""
+        self._dirty_terms.update(OUTDOOR_PART_TERMS[part] for part in parts)
+        self._schedule_update(priority=False, batched=True)
+
+    @callback
+    def _schedule_update(self, priority: bool, batched: bool) -> None:
+        """Run or schedule an update for the dirty terms (see _handle_state_change)."""
+        interval = self._update_interval
+        if batched and self._adaptive:
+            # Sunrise or a passing front follows the adaptive interval, and is
+            # never held longer than max_update_wait
+            interval = min(interval, self._max_update_wait)
+        if not self._inputs.occupied:
+            interval = max(interval, UNOCCUPIED_UPDATE_INTERVAL)
+
+        # 1. If interval is 0 or the input is high priority, update instantly
+        if interval <= 0 or priority:
+            self._perform_update()
+            return
+
+        now = time.time()
+        next_allowed = self._last_update_time + interval
+        if batched:
+            # max_update_wait bounds how long batched events are deferred: a
+            # stream of them runs at most once per wait, a first one on an
+            # idle room runs at once
+            wait = self._max_update_wait
+            if self._adaptive:
+                wait = min(wait, self._update_interval)
+            due = max(next_allowed, self._last_update_time + wait)
+        else:
+            due = next_allowed
+
+        # 2. Leading edge: enough time has passed and nothing is queued
+        if due <= now and self._scheduled_update_time is None:
+            self._perform_update()
+            return
+
+        # 3. Otherwise make sure an update is scheduled no later than due.
+        # An existing earlier timer is kept, so a steady stream of events
+        # can never push the update further out.
+        if self._scheduled_update_time is not None:
+            if self._scheduled_update_time <= due:
+                return
+            self._cancel_scheduled_update()
+        self._scheduled_update_time = due
+        self._cancel_scheduled_update = async_call_later(
+            self.hass, max(0.0, due - now), self._scheduled_update_callback
+        )
+
+    @callback
+    def _scheduled_update_callback(self, _) -> None:
+        """Called when the rate-limit timer expires."""
+        self._cancel_scheduled_update = None
+        self._scheduled_update_time = None
+        self._perform_update()
+
+    @callback
+    def _perform_update(self) -> None:
+        """Refresh the changed inputs, run the room model and notify all entities."""
+        self._last_update_time = time.time()
+        # Whatever was queued is covered by this update
+        if self._cancel_scheduled_update:
+            self._cancel_scheduled_update()
+            self._cancel_scheduled_update = None
+            self._scheduled_update_time = None
+        if not self._siblings_ready():
+            self._resolve_sibling_ids()
+        dirty, self._dirty_terms = self._dirty_terms, set()
+        plan = self._plan
+        for term in dirty:
+            for read in plan[term]:
+                read()
+        self._stale_terms |= dirty
+        inputs = self._inputs
+
+        if self._pending is not None:
+            # An engine result is on its way, it will publish these terms as well
+            self._pending[2].update(dirty)
+            if not dirty & MRT_TERMS:
+                return
+        elif not dirty & MRT_TERMS and (self.data or {}).get("mrt") is not None:
+            # Nothing the MRT depends on changed, keep the current value
+            self.async_set_updated_data(self._run_model(inputs, None, dirty))
+            return
+
+        prepared = self._prepare_mrt(inputs)
+        if prepared is None:
+            # MRT cannot run, publish the other outputs right away
+            if self._pending is not None:
+                dirty = self._pending[2]
+                self._pending = None
+            self.async_set_updated_data(self._run_model(inputs, None, dirty))
+            return
+
+        params, snapshot, attrs = prepared
+        if self._pending is not None:
+            dirty = self._pending[2]
+        self._pending = (inputs, attrs, set(dirty))
+        self._engine.async_submit(
+            self._entry.entry_id,
+            params,
+            snapshot,
+            inputs.sun_azimuth,
+            inputs.sun_elevation,
+            inputs.irradiance,
+            inputs.glazing_shading,
+        )
+
+    @callback
+    def _handle_engine_result(
+        self, result: physics.MRTResult, irradiance: float
+    ) -> None:
+        """Finish the room model once the engine has evaluated the MRT."""
+        if self._pending is None:
+            return
+        inputs, attrs, dirty = self._pending
+        self._pending = None
+        mrt = self._finish_mrt(attrs, result, irradiance)
+        if self._projection is None:
+            # First run since a forecast arrived before the model could run
+            self._projection = self._compute_projection()
+        self.async_set_updated_data(self._run_model(inputs, mrt, dirty))
+
+    @callback
+    def _handle_forecast_update(self) -> None:
+        """Project the room over a new forecast (only on forecast refreshes)."""
+        self._projection = self._compute_projection()
+        if self.data is not None:
+            self.async_set_updated_data({**self.data, "projection": self._projection})
+
+    async def _async_update_data(self) -> dict[str, SensorResult]:
+        """Refresh on demand; the new MRT result is pushed by the next engine tick."""
+        self._dirty_terms = set(ALL_TERMS)
+        self._perform_update()
+        return self.data or {}
+
+    # ------------------------------------------------------------------
+    # Input snapshot
+    # ------------------------------------------------------------------
+    def _state(self, entity_id: str | None) -> State | None:
+        """Input state from the event-fed cache (seeded from the state machine)."""
+        if not entity_id:
+            return None
+        try:
+            return self._states[entity_id]
+        except KeyError:
+            # Not tracked (e.g. a control resolved after startup), read it live
+            return self.hass.states.get(entity_id)
+
+    def _sibling_float(self, key: str, default):
+        return self._parser.state(self._state(self.sibling_ids.get(key)), default=default)
+
+    def _build_input_terms(self) -> dict[str, frozenset[str]]:
+        """Map every tracked entity to the model terms it feeds."""
+        input_terms: dict[str, set[str]] = {}
+
+        def add(entity_id: str | None, *terms: str) -> None:
+            if entity_id:
+                input_terms.setdefault(entity_id, set()).update(terms)
+
+        add(self.entity_air, TERM_AIR)
+        add(self.entity_rh, TERM_HUMIDITY)
+        add(self.entity_climate, TERM_AIRFLOW, TERM_RADIANT)
+        add(self.entity_window, TERM_AIRFLOW)
+        add(self.entity_door, TERM_AIRFLOW)
+        add(self.entity_fan, TERM_AIRFLOW)
+        add(self.entity_shading, TERM_SHADING)
+        for element in self.glazing:
+            add(element.shading, TERM_SHADING)
+        add(self.entity_wall_sensor, TERM_SURFACE)
+        add(self.entity_cal_rh, TERM_SURFACE)
+        add(self.entity_occupancy, TERM_OCCUPANCY)
+        for key, entity_id in self.sibling_ids.items():
+            add(entity_id, SIBLING_TERMS[key])
+        return {entity_id: frozenset(terms) for entity_id, terms in input_terms.items()}
+
+    def _build_input_attributes(self) -> dict[str, frozenset[str]]:
+        """
+        Map every tracked entity to the attributes the readers use. Binary
+        inputs and the number/select controls are read from the state alone.
+        """
+        input_attributes: dict[str, frozenset[str]] = {}
+
+        def add(entity_id: str | None, attributes: frozenset[str]) -> None:
+            if entity_id:
+                input_attributes[entity_id] = (
+                    input_attributes.get(entity_id, frozenset()) | attributes
+                )
+
+        for entity_id in (
+            self.entity_air,
+            self.entity_rh,
+            self.entity_wall_sensor,
+            self.entity_cal_rh,
+        ):
+            add(entity_id, SENSOR_ATTRIBUTES)
+        add(self.entity_climate, CLIMATE_ATTRIBUTES)
+        for entity_id in (
+            self.entity_window,
+            self.entity_door,
+            self.entity_fan,
+            self.entity_occupancy,
+        ):
+            add(entity_id, frozenset())
+        for shading in (
+            self.entity_shading,
+            *(element.shading for element in self.glazing),
+        ):
+            if shading and shading.split(".", 1)[0] == "cover":
+                add(shading, COVER_ATTRIBUTES)
+            else:
+                add(shading, frozenset())
+        for entity_id in self.sibling_ids.values():
+            add(entity_id, frozenset())
+        return input_attributes
+
+    def _compile_plan(self) -> dict[str, tuple[Callable[[], None], ...]]:
+        """
+        Resolve every input source once and return the readers per term.
+
+        Which entity feeds an input, and how a shading entity is interpreted,
+        is fixed by entry.data; a config change reloads the entry, which
+        compiles a new plan. The runtime fallbacks for unavailable sensors stay
+        in the readers. Outdoor inputs are copied from the shared outdoor hub,
+        which resolves their sources the same way.
+        """
+        inputs = self._inputs
+        state = self._state
+        sibling_float = self._sibling_float
+
+        parse = self._parser.state
+
+        def read_sensor(entity_id: str | None, field_name: str, kind: str | None = None):
+            # Unconfigured sensors are left at their RoomInputs default (None)
+            if not entity_id:
+                return None
+            return lambda: setattr(
+                inputs, field_name, parse(state(entity_id), kind)
+            )
+
+        def steps(*readers) -> tuple[Callable[[], None], ...]:
+            return tuple(reader for reader in readers if reader is not None)
+
+        # --- Outdoor, Pressure, Sky, Sun (shared hub) ---
+        outdoor = self._outdoor.conditions
+
+        def read_outdoor() -> None:
+            inputs.t_out = outdoor.t_out
+            inputs.rh_out = outdoor.rh_out
+            inputs.outdoor_source = outdoor.outdoor_source
+            inputs.wind_ms = outdoor.wind_ms
+            inputs.t_out_eff = outdoor.t_out_eff
+            inputs.outdoor_attrs = outdoor.outdoor_attrs
+            inputs.h_out = outdoor.enthalpy
+            inputs.w_out = outdoor.mixing_ratio
+
+        def read_pressure() -> None:
+            inputs.pressure = outdoor.pressure
+            inputs.h_out = outdoor.enthalpy
+            inputs.w_out = outdoor.mixing_ratio
+
+        def read_radiation() -> None:
+            inputs.irradiance = outdoor.irradiance
+            inputs.radiation_attrs = outdoor.radiation_attrs
+
+        def read_sun_position() -> None:
+            sun = outdoor.sun
+            inputs.sun_azimuth = sun.azimuth if sun else None
+            inputs.sun_elevation = sun.elevation if sun else None
+            inputs.sun_up = bool(sun and sun.above_horizon)
+
+        # --- Airflow ---
+        climate_id = self.entity_climate
+        airflow: list[Callable[[], None]] = []
+        climate_readers: tuple[Callable[[], None], ...] = ()
+        if climate_id:
+
+            def read_climate() -> None:
+                climate = state(climate_id)
+                attributes = climate.attributes if climate else {}
+                inputs.hvac_action = attributes.get("hvac_action")
+                inputs.fan_mode = attributes.get("fan_mode")
+
+            climate_readers = (read_climate,)
+            airflow.append(read_climate)
+        if self.entity_window:
+            window_id = self.entity_window
+
+            def read_window() -> None:
+                window = state(window_id)
+                inputs.window_open = bool(window and window.state.lower() == "on")
+
+            airflow.append(read_window)
+        if self.entity_door:
+            door_id = self.entity_door
+
+            def read_door() -> None:
+                door = state(door_id)
+                inputs.door_open = bool(door and door.state.lower() == "on")
+
+            airflow.append(read_door)
+        if self.entity_fan:
+            fan_id = self.entity_fan
+
+            def read_fan() -> None:
+                fan = state(fan_id)
+                inputs.fan_state = None
+                if fan and fan.state not in ("off", *INVALID_STATES, None):
+                    inputs.fan_state = str(fan.state).lower()
+
+            airflow.append(read_fan)
+
+        def read_air_speeds() -> None:
+            inputs.manual_speed = sibling_float(CONF_MANUAL_AIR_SPEED, 0.0)
+            inputs.hvac_speed = sibling_float(
+                CONF_HVAC_AIR_SPEED, DEFAULT_AIR_SPEED_HVAC
+            )
+
+        airflow.append(read_air_speeds)
+
+        # --- Room Controls (number/select siblings) ---
+        profile_key = self._config[CONF_ROOM_PROFILE]
+        defaults = ROOM_PROFILES[profile_key]["data"]
+
+        def read_factors() -> None:
+            profile_state = state(self.sibling_ids.get("profile"))
+            inputs.profile = profile_key
+            if profile_state and profile_state.state not in INVALID_STATES:
+                inputs.profile = profile_state.state
+            inputs.f_out = sibling_float("f_out", defaults[0])
+            inputs.f_win = sibling_float("f_win", defaults[1])
+            inputs.k_loss = sibling_float("k_loss", defaults[2])
+            inputs.k_solar = sibling_float("k_solar", defaults[3])
+            inputs.alpha = sibling_float(CONF_THERMAL_ALPHA, 0.3)
+
+        radiant: tuple[Callable[[], None], ...] = ()
+        if self.is_radiant:
+
+            def read_radiant() -> None:
+                inputs.radiant_temp = sibling_float(CONF_RADIANT_SURFACE_TEMP, 24.0)
+                type_state = state(self.sibling_ids.get(CONF_RADIANT_TYPE))
+                if type_state:
+                    inputs.radiant_type = type_state.state
+
+            radiant = (*climate_readers, read_radiant)
+
+        def read_comfort() -> None:
+            inputs.clo = sibling_float(CONF_CLOTHING_INSULATION, 0.6)
+            inputs.met = sibling_float(CONF_METABOLISM, 1.1)
+
+        occupancy: tuple[Callable[[], None], ...] = ()
+        if self.entity_occupancy:
+            occupancy_id = self.entity_occupancy
+
+            def read_occupancy() -> None:
+                presence = state(occupancy_id)
+                inputs.occupied = not (
+                    presence and presence.state.lower() in UNOCCUPIED_STATES
+                )
+
+            occupancy = (read_occupancy,)
+
+        return {
+            TERM_AIR: steps(read_sensor(self.entity_air, "t_air", KIND_TEMPERATURE)),
+            TERM_HUMIDITY: steps(read_sensor(self.entity_rh, "rh")),
+            TERM_PRESSURE: (read_pressure,),
+            TERM_OUTDOOR: (read_outdoor,),
+            TERM_RADIATION: (read_radiation,),
+            TERM_SUN: (read_sun_position,),
+            TERM_AIRFLOW: tuple(airflow),
+            TERM_SHADING: self._compile_shading_readers(),
+            TERM_FACTORS: (read_factors,),
+            TERM_RADIANT: radiant,
+            TERM_COMFORT: (read_comfort,),
+            TERM_SURFACE: steps(
+                read_sensor(self.entity_wall_sensor, "wall_temp", KIND_TEMPERATURE),
+                read_sensor(self.entity_cal_rh, "surface_rh"),
+            ),
+            TERM_OCCUPANCY: occupancy,
+        }
+
+    def _compile_shading_readers(self) -> tuple[Callable[[], None], ...]:
+        """Readers for the room's shading and that of each glazing element."""
+        inputs = self._inputs
+        room_shading = self._compile_shading_factor(self.entity_shading)
+
+        def read_shading() -> None:
+            inputs.shading = room_shading()
+
+        if not self.glazing:
+            return (read_shading,)
+
+        # Elements without their own shading entity follow the room's
+        element_shading = tuple(
+            self._compile_shading_factor(element.shading) if element.shading else None
+            for element in self.glazing
+        )
+
+        def read_glazing_shading() -> None:
+            inputs.glazing_shading = tuple(
+                inputs.shading if factor is None else factor()
+                for factor in element_shading
+            )
+
+        return (read_shading, read_glazing_shading)
+
+    def _compile_shading_factor(self, entity_id: str | None) -> Callable[[], float]:
+        """Pick the shading interpretation (0.0 to 1.0) for the entity's domain."""
+        if not entity_id:
+            return lambda: 1.0
+
+        state = self._state
+        domain = entity_id.split(".", 1)[0]
+
+        # --- CASE 1: COVERS ---
+        if domain == "cover":
+
+            def factor(state_obj: State) -> float:
+                current_pos = state_obj.attributes.get("current_position")
+                if current_pos is not None:
+                    try:
+                        return float(current_pos) / 100.0
+                    except ValueError:
+                        pass
+                return 0.0 if state_obj.state == "closed" else 1.0
+
+        # --- CASE 2: NUMBERS / SENSORS ---
+        elif domain in ("input_number", "sensor", "number"):
+
+            def factor(state_obj: State) -> float:
+                try:
+                    val = float(state_obj.state)
+                except ValueError:
+                    return 1.0
+                if val > 1.0:
+                    return min(1.0, val / 100.0)
+                return max(0.0, val)
+
+        # --- CASE 3: BINARY ---
+        else:
+
+            def factor(state_obj: State) -> float:
+                return 0.0 if state_obj.state == "off" else 1.0
+
+        def read_factor() -> float:
+            state_obj = state(entity_id)
+            if not state_obj or state_obj.state in INVALID_STATES:
+                return 1.0
+            return factor(state_obj)
+
+        return read_factor
+
+    # ------------------------------------------------------------------
+    # Room model
+    # ------------------------------------------------------------------
+    def _run_model(
+        self, inputs: RoomInputs, mrt: SensorResult | None, dirty: set[str]
+    ) -> dict[str, SensorResult]:
+        """
+        Compute the outputs of the room affected by the dirty terms.
+
+        Outputs that depend on none of the dirty terms keep their last result.
+        While the room is unoccupied the comfort outputs are frozen between
+        heartbeats; the terms changed meanwhile are applied on the next one.
+        """
+        previous = self.data or {}
+        results: dict[str, SensorResult] = {}
+
+        now = time.time()
+        comfort_dirty = self._comfort_dirty | dirty
+        comfort_frozen = (
+            not inputs.occupied
+            and now - self._comfort_time < UNOCCUPIED_COMFORT_INTERVAL
+        )
+        if comfort_frozen:
+            self._comfort_dirty = comfort_dirty
+        else:
+            self._comfort_time = now
+            self._comfort_dirty = set()
+
+        def update(key: str, compute: Callable[[], SensorResult | None]) -> None:
+            terms = dirty
+            if key in COMFORT_OUTPUTS:
+                if comfort_frozen and previous.get(key) is not None:
+                    results[key] = previous[key]
+                    return
+                terms = comfort_dirty
+            if terms & OUTPUT_TERMS[key] or previous.get(key) is None:
+                results[key] = compute()
+            else:
+                results[key] = previous[key]
+
+        # MRT keeps its last value if the model cannot run on this snapshot
+        if mrt is None:
+            mrt = previous.get("mrt")
+        results["mrt"] = mrt
+        update("operative", lambda: self._compute_operative(inputs, mrt))
+
+        if self.entity_rh:
+            t, rh = inputs.t_air, inputs.rh
+            if t is not None and rh is not None:
+                psy = self._psychro_state(inputs)
+                base = {
+                    "input_air_temp": t,
+                    "input_relative_humidity": rh,
+                    "input_pressure_hpa": inputs.pressure,
+                }
+                update("dew_point", lambda: self._compute_dew_point(psy, base))
+                update("frost_point", lambda: self._compute_frost_point(psy, base))
+                update("abs_humidity", lambda: self._compute_abs_humidity(psy, base))
+                update("enthalpy", lambda: self._compute_enthalpy(inputs, psy, base))
+                update("humidex", lambda: self._compute_humidex(psy, base))
+                update("perception", lambda: self._compute_perception(psy, base))
+                update("mold_risk", lambda: self._compute_mold_risk(inputs, psy, base))
+                results["mold_index"] = self._advance_mold_index(
+                    results["mold_risk"]
+                )
+                update(
+                    "heat_flux", lambda: self._compute_heat_flux(inputs, mrt, base)
+                )
+                update(
+                    "moisture_excess",
+                    lambda: self._compute_moisture_excess(inputs, psy, base),
+                )
+            else:
+                results["mold_index"] = self._pause_mold_index()
+            update("pmv", lambda: self._compute_pmv(inputs, mrt))
+
+        if self.entity_wall_sensor:
+            update("calibration_k", lambda: self._compute_calibration(inputs))
+
+        # Only recomputed when a new forecast arrives
+        results["projection"] = self._projection
+        # Only fresh values measure the rate; a copied one would read as flat
+        if self._adaptive and results.get("operative") is not previous.get(
+            "operative"
+        ):
+            self._adapt_update_interval(results.get("operative"))
+        return results
+
+    def _adapt_update_interval(self, operative: SensorResult | None) -> None:
+        """
+        Set the update interval from the recent derivative of the (smoothed)
+        operative temperature: short while it moves fast (sunrise, door
+        opened, HVAC started), long once it is flat.
+        """
+        if operative is None or operative.native_value is None:
+            return
+        now = time.time()
+        value = float(operative.native_value)
+        sample, self._rate_sample = self._rate_sample, (now, value)
+        if sample is None or now <= sample[0]:
+            return
+
+        rate = abs(value - sample[1]) / (now - sample[0])  # °C/s
+        if rate >= self._output_rate:
+            self._output_rate = rate
+        else:
+            self._output_rate += ADAPTIVE_RATE_DECAY * (rate - self._output_rate)
+
+        if self._output_rate > 0:
+            interval = ADAPTIVE_UPDATE_STEP / self._output_rate
+        else:
+            interval = ADAPTIVE_UPDATE_CEILING
+        self._update_interval = min(
+            max(interval, ADAPTIVE_UPDATE_FLOOR), ADAPTIVE_UPDATE_CEILING
+        )
+
+    def _calculate_v_air(self, inputs: RoomInputs) -> float:
+        """Determines the effective air velocity (m/s) based on priority logic."""
+        # Start with default still air speed
+        potential_speeds = [DEFAULT_AIR_SPEED_STILL]
+
+        # --- Check Manual Override ---
+        if inputs.manual_speed > 0:
+            potential_speeds.append(inputs.manual_speed)
+
+        # --- Check Natural Ventilation ---
+        if inputs.window_open:
+            potential_speeds.append(DEFAULT_AIR_SPEED_WINDOW)
+        if inputs.door_open:
+            potential_speeds.append(DEFAULT_AIR_SPEED_DOOR)
+
+        # --- Check HVAC (Forced Air) ---
+        if not self.is_radiant and self.entity_climate:
+            is_active = inputs.hvac_action not in ["off", "idle", None]
+            is_fan_forced = inputs.fan_mode == "on"
+            if is_active or is_fan_forced:
+                potential_speeds.append(inputs.hvac_speed)
+
+        # --- Check Local Fan Entity ---
+        if inputs.fan_state:
+            potential_speeds.append(
+                FAN_SPEED_MAP.get(inputs.fan_state, inputs.hvac_speed)
+            )
+
+        return max(potential_speeds)
+
+    def _prepare_mrt(
+        self, inputs: RoomInputs
+    ) -> tuple[physics.MRTParams, physics.MRTInputs, dict[str, Any]] | None:
+        """
+        Derive the MRT model inputs and record them as attributes.
+
+        Only the terms whose inputs changed since they were last derived are
+        recomputed; the others are taken from the term cache.
+        """
+        if not self._siblings_ready():
+            _LOGGER.debug(
+                "Could not find all required entities for %s, calculation will be delayed.",
+                self.name,
+            )
+            return None
+
+        t_air = inputs.t_air
+        t_out = inputs.t_out
+        if t_air is None or t_out is None:
+            # If we have absolutely no data, we can't run the physics model safely.
+            return None
+
+        stale = self._stale_terms
+        terms = self._terms
+        if TERM_AIRFLOW in stale or TERM_AIRFLOW not in terms:
+            terms[TERM_AIRFLOW] = self._derive_airflow(inputs)
+        if TERM_FACTORS in stale or TERM_FACTORS not in terms:
+            terms[TERM_FACTORS] = self._derive_factors(inputs, self.solar_gain_scale)
+        if TERM_SHADING in stale or TERM_SHADING not in terms:
+            terms[TERM_SHADING] = {"shading_factor": round(inputs.shading, 2)}
+            if self.glazing:
+                terms[TERM_SHADING]["glazing_shading"] = [
+                    round(value, 2) for value in inputs.glazing_shading
+                ]
+        stale.difference_update(MRT_TERMS)
+
+        v_air, airflow_attrs = terms[TERM_AIRFLOW]
+        t_out_eff, outdoor_attrs = inputs.t_out_eff, inputs.outdoor_attrs
+        params, factor_attrs = terms[TERM_FACTORS]
+        radiation_attrs = inputs.radiation_attrs
+
+        attrs: dict[str, Any] = {
+            **airflow_attrs,
+            "profile": inputs.profile,
+            "orientation": self._config[CONF_ORIENTATION],
+            "t_air": t_air,
+            **outdoor_attrs,
+            **factor_attrs,
+            **radiation_attrs,
+            **terms[TERM_SHADING],
+        }
+        if self.glazing:
+            attrs["glazing_elements"] = len(self.glazing)
+            attrs["glazing_area"] = round(sum(g.area for g in self.glazing), 2)
+
+        # --- Radiant Boost (a filter, stepped on every MRT run) ---
+        new_boost = 0.0
+        if self.is_radiant:
+            system_props = RADIANT_TYPES.get(
+                inputs.radiant_type, RADIANT_TYPES["high_mass"]
+            )
+            now = time.monotonic()
+            new_boost = physics.radiant_boost_step(
+                self._radiant_boost_stored,
+                t_air,
+                inputs.radiant_temp,
+                system_props["view_factor"],
+                system_props["alpha"],
+                inputs.hvac_action == "heating",
+                None
+                if self._radiant_boost_time is None
+                else now - self._radiant_boost_time,
+            )
+            self._radiant_boost_stored = new_boost
+            self._radiant_boost_time = now
+        attrs["radiant_boost_current"] = round(new_boost, 2)
+
+        snapshot = physics.MRTInputs(
+            t_air=t_air,
+            t_out_eff=t_out_eff,
+            wind_ms=inputs.wind_ms,
+            shading=inputs.shading,
+            radiant_boost=new_boost,
+            v_air=v_air,
+        )
+        return params, snapshot, attrs
+
+    def _derive_airflow(self, inputs: RoomInputs) -> tuple[float, dict[str, Any]]:
+        v_air = self._calculate_v_air(inputs)
+        return v_air, {"air_speed_ms_convective": round(v_air, 2)}
+
+    @staticmethod
+    def _derive_factors(
+        inputs: RoomInputs, solar_gain_scale: float
+    ) -> tuple[physics.MRTParams, dict[str, Any]]:
+        params = physics.MRTParams(
+            inputs.f_out,
+            inputs.f_win,
+            inputs.k_loss,
+            inputs.k_solar * solar_gain_scale,
+            inputs.alpha,
+        )
+        attrs = {
+            "factor_f_out": inputs.f_out,
+            "factor_f_win": inputs.f_win,
+            "factor_k_loss": inputs.k_loss,
+            "factor_k_solar": inputs.k_solar,
+            "thermal_alpha": inputs.alpha,
+        }
+        if solar_gain_scale != 1.0:
+            attrs["solar_gain_scale"] = solar_gain_scale
+        return params, attrs
+
+    @staticmethod
+    def _finish_mrt(
+        attrs: dict[str, Any], result: physics.MRTResult, irradiance: float
+    ) -> SensorResult:
+        """Add the engine's terms to the prepared attributes."""
+        # Beam, sky diffuse and ground-reflected, area-weighted, before shading
+        attrs["glazing_irradiance"] = round(irradiance, 1)
+        attrs["loss_term"] = round(result.loss_term, 3)
+        attrs["solar_term"] = round(result.solar_term, 3)
+        attrs["mrt_unclamped"] = round(result.mrt_unclamped, 2)
+        # T_surf = T_air - (Delta_T * k_loss), using t_out_eff for wind chill
+        attrs["estimated_wall_surface_temp"] = round(result.wall_temp_est, 1)
+        attrs["mrt_clamped"] = round(result.mrt_clamped, 2)
+        return SensorResult(round(result.mrt, 2), attrs)
+
+    def _compute_operative(
+        self, inputs: RoomInputs, mrt: SensorResult | None
+    ) -> SensorResult | None:
+        """Operative Temp, weighted between air and MRT by air speed."""
+        if mrt is None or mrt.native_value is None or inputs.t_air is None:
+            return None
+
+        air = inputs.t_air
+        attrs = dict(mrt.attributes)
+        v_air = attrs.get("air_speed_ms_convective", DEFAULT_AIR_SPEED_STILL)
+
+        # A = Radiant Weighting Factor
+        radiant_weighting_A = physics.radiant_weighting(v_air)
+        convective_weighting_B = 1.0 - radiant_weighting_A
+        operative_temp = physics.operative_temperature(air, mrt.native_value, v_air)
+
+        attrs["room_area_m2"] = self.room_area
+        attrs["mrt_smoothed"] = mrt.native_value
+        attrs["t_air"] = air
+        attrs["operative_temperature"] = operative_temp
+        attrs["radiant_weighting_factor"] = round(radiant_weighting_A, 2)
+        attrs["convective_weighting_factor"] = round(convective_weighting_B, 2)
+        attrs["floor_level"] = self.floor_level
+        return SensorResult(round(operative_temp, 2), attrs)
+
+    def _psychro_state(self, inputs: RoomInputs) -> physics.PsychroState:
+        """
+        The room's psychrometric state, recomputed only when T, RH, P or the
+        saturation formula changed.
+        """
+        psy = self._psychro
+        if psy is None or (psy.t_air, psy.rh, psy.pressure, psy.formula) != (
+            inputs.t_air,
+            inputs.rh,
+            inputs.pressure,
+            physics.saturation_formula(),
+        ):
+            psy = self._psychro = physics.psychro_state(
+                inputs.t_air, inputs.rh, inputs.pressure
+            )
+        return psy
+
+    @staticmethod
+    def _compute_dew_point(psy: physics.PsychroState, base) -> SensorResult:
+        return SensorResult(round(psy.dew_point, 1), dict(base))
+
+    @staticmethod
+    def _compute_frost_point(psy: physics.PsychroState, base) -> SensorResult:
+        attrs = {**base, "calculated_dew_point": round(psy.dew_point, 2)}
+        return SensorResult(round(psy.frost_point, 1), attrs)
+
+    @staticmethod
+    def _compute_abs_humidity(psy: physics.PsychroState, base) -> SensorResult:
+        # Volumetric Abs Humidity (g/m³) - Pressure Independent approx
+        # Engineering Metrics (Pressure Dependent) as attributes
+        attrs = dict(base)
+        attrs["humidity_ratio_g_kg"] = round(psy.mixing_ratio, 2)
+        attrs["air_density_kg_m3"] = round(psy.density, 3)
+        attrs["vapor_pressure_hpa"] = round(psy.vp_actual, 2)
+        return SensorResult(round(psy.abs_humidity, 2), attrs)
+
+    @staticmethod
+    def _compute_enthalpy(
+        inputs: RoomInputs, psy: physics.PsychroState, base
+    ) -> SensorResult:
+        h_in = psy.enthalpy
+        attrs = dict(base)
+
+        h_out = inputs.h_out
+        if h_out is not None:
+            attrs["outdoor_enthalpy"] = round(h_out, 2)
+            attrs["outdoor_source"] = inputs.outdoor_source
+
+            # Positive means Inside has MORE energy (Open windows to cool)
+            diff = h_in - h_out
+            attrs["enthalpy_difference"] = round(diff, 2)
+            if diff > 1.0:
+                attrs["economizer_status"] = "Free Cooling Available"
+            elif diff < -1.0:
+                attrs["economizer_status"] = "Unfavorable (Keep Closed)"
+            else:
+                attrs["economizer_status"] = "Neutral"
+
+        return SensorResult(round(h_in, 2), attrs)
+
+    @staticmethod
+    def _compute_humidex(psy: physics.PsychroState, base) -> SensorResult:
+        attrs = {**base, "calculated_dew_point": round(psy.dew_point, 2)}
+        return SensorResult(round(psy.humidex, 1), attrs)
+
+    @staticmethod
+    def _compute_perception(psy: physics.PsychroState, base) -> SensorResult:
+        humidex = psy.humidex
+        attrs = {
+            **base,
+            "calculated_dew_point": round(psy.dew_point, 2),
+            "calculated_humidex": round(humidex, 1),
+        }
+
+        if humidex < 30:
+            return SensorResult("comfortable", attrs, "mdi:emoticon-happy")
+        if humidex < 35:
+            return SensorResult("noticeable_discomfort", attrs, "mdi:emoticon-neutral")
+        if humidex < 40:
+            return SensorResult("evident_discomfort", attrs, "mdi:emoticon-sad")
+        if humidex < 46:
+            return SensorResult("intense_discomfort", attrs, "mdi:emoticon-cry")
+        if humidex < 54:
+            return SensorResult("dangerous_discomfort", attrs, "mdi:alert")
+        return SensorResult("heat_stroke_imminent", attrs, "mdi:alert-octagon")
+
+    def _advance_mold_index(self, mold_risk: SensorResult) -> SensorResult:
+        """
+        Step the VTT mold index over the time since the last update, with the
+        surface conditions of that update (held until now). O(1) per update,
+        no history needed; time while Home Assistant was stopped is skipped.
+        """
+        now = time.time()
+        if self._mold_sample is not None:
+            then, t_surface, rh_surface = self._mold_sample
+            hours = min(max(now - then, 0.0), MOLD_INDEX_MAX_STEP) / 3600.0
+            self._mold_index, self._mold_unfavourable = physics.mold_index_step(
+                self._mold_index,
+                self._mold_unfavourable,
+                t_surface,
+                rh_surface,
+                hours,
+                self._mold_sensitivity,
+            )
+        self._mold_sample = (
+            now,
+            mold_risk.attributes["wall_surface_temp"],
+            mold_risk.native_value,
+        )
+        return self._mold_index_result()
+
+    def _pause_mold_index(self) -> SensorResult:
+        """
+        Hold the index while the air temperature or RH is unavailable: the
+        surface conditions are unknown, so the outage is skipped instead of
+        being integrated with the last ones.
+        """
+        self._mold_sample = None
+        return self._mold_index_result()
+
+    def _mold_index_result(self) -> SensorResult:
+        """Index with the conditions it is currently integrating."""
+        index = self._mold_index
+        if index < 1:
+            level, icon = "no_growth", "mdi:shield-check"
+        elif index < 3:
+            level, icon = "microscopic", "mdi:alert-box-outline"
+        elif index < 5:
+            level, icon = "visible", "mdi:alert-decagram"
+        else:
+            level, icon = "heavy", "mdi:alert-octagon"
+        attrs = {
+            "growth_level": level,
+            "sensitivity_class": MOLD_INDEX_SENSITIVITY,
+            "unfavourable_hours": round(self._mold_unfavourable, 2),
+            "integrating": self._mold_sample is not None,
+        }
+        if self._mold_sample is not None:
+            _, t_surface, rh_surface = self._mold_sample
+            attrs["surface_temp"] = t_surface
+            attrs["surface_rh"] = rh_surface
+            attrs["critical_rh"] = round(
+                physics.mold_critical_rh(t_surface, self._mold_sensitivity), 1
+            )
+        return SensorResult(round(index, 3), attrs, icon)
+
+    @staticmethod
+    def _mold_risk_level(rh_val: float) -> tuple[str, str]:
+        """Risk text and icon based on surface RH."""
+        if rh_val < 60:
+            return "Low", "mdi:shield-check"
+        if rh_val < 80:
+            return "Warning", "mdi:alert-box-outline"
+        return "Critical", "mdi:alert-decagram"
+
+    def _compute_mold_risk(
+        self, inputs: RoomInputs, psy: physics.PsychroState, base
+    ) -> SensorResult:
+        """
+        Surface RH at the coldest wall.
+        Prioritizes physical Surface Humidity measurement if available.
+        Falls back to calculating estimated humidity at the wall surface using T_out/k_loss.
+        """
+        t_air, rh = inputs.t_air, inputs.rh
+        attrs = dict(base)
+
+        # Fallback to indoor temp (implies Delta T = 0)
+        t_out = inputs.t_out if inputs.t_out is not None else t_air
+
+        # Wall Surface Temperature (Physical Sensor -> Calculation)
+        t_surface = inputs.wall_temp
+        if t_surface is None:
+            t_surface = physics.mold_wall_temp(t_air, t_out, inputs.k_loss)
+            attrs["insulation_factor_k"] = inputs.k_loss
+
+        # RH of the room air when it touches the cold wall
+        surface_rh = physics.surface_relative_humidity(
+            t_air, rh, t_surface, psy.vp_actual
+        )
+
+        # Direct measurement (the gold standard) wins over the calculation
+        if inputs.surface_rh is not None:
+            value = inputs.surface_rh
+            attrs["calculation_method"] = "measured_surface_humidity"
+        else:
+            value = surface_rh
+            if inputs.wall_temp is not None:
+                attrs["calculation_method"] = "calculated_using_wall_temp_sensor"
+            else:
+                attrs["calculation_method"] = "calculated_using_k_loss"
+        risk_level, icon = self._mold_risk_level(value)
+        attrs["risk_level"] = risk_level
+
+        attrs["outdoor_temp"] = t_out
+        attrs["wall_surface_temp"] = round(t_surface, 1)
+        attrs["theoretical_surface_rh"] = round(surface_rh, 1)
+        return SensorResult(round(value, 1), attrs, icon)
+
+    @staticmethod
+    def _calculate_dynamic_film_coefficient(v_air: float) -> tuple[float, str]:
+        """
+        Calculate h_film = h_radiative + h_convective
+        Standard ASHRAE 55 / ISO 7730 models.
+        Returns: (h_value, reason_string)
+        """
+        if v_air <= physics.STILL_AIR_LIMIT:
+            reason = "Natural Convection (Still Air)"
+        else:
+            reason = f"Forced Convection (Air Speed: {v_air:.2f} m/s)"
+
+        return physics.film_coefficient(v_air), reason
+
+    def _envelope_areas(self) -> tuple[float, float, str]:
+        """Opaque and window area (m²) for the heat loss, and how they were found."""
+        if self.wall_area_gross is not None:
+            area_gross = float(self.wall_area_gross)
+            area_win = float(self.window_area)
+            return max(0.0, area_gross - area_win), area_win, "geometry_inputs"
+        # Fallback: Assume Wall Area = Floor Area, No Windows
+        return float(self.room_area), 0.0, "fallback_to_floor_area"
+
+    def _compute_heat_flux(
+        self, inputs: RoomInputs, mrt: SensorResult | None, base
+    ) -> SensorResult:
+        """Heat Flux (Energy Loss) through the wall in W/m² plus total Watts."""
+        t_air = inputs.t_air
+        attrs = dict(base)
+
+        t_out = inputs.t_out if inputs.t_out is not None else t_air - 10
+
+        # Wall Surface Temp (for Opaque Wall)
+        t_surface = inputs.wall_temp
+        if t_surface is None:
+            t_surface = physics.estimated_wall_temp(t_air, t_out, inputs.k_loss)
+
+        # Opaque Wall Flux, air speed from the MRT model (central source of truth)
+        v_air = 0.1
+        if mrt is not None:
+            v_air = mrt.attributes.get("air_speed_ms_convective", 0.1)
+        h_film, h_reason = self._calculate_dynamic_film_coefficient(v_air)
+
+        # Total Watts (Split Method)
+        area_opaque, area_win, calc_mode = self._envelope_areas()
+
+        loss = physics.heat_loss(
+            t_air, t_out, t_surface, v_air, area_opaque, area_win, self.window_u
+        )
+        heat_flux_wall = loss.heat_flux_wall
+        delta_t_air_out = max(0.0, t_air - t_out)
+
+        attrs["wall_surface_temp"] = round(t_surface, 1)
+        attrs["outdoor_temp"] = t_out
+        attrs["film_coefficient_h"] = round(h_film, 2)
+        attrs["film_coefficient_type"] = h_reason
+        attrs["total_heat_loss_watts"] = round(loss.total, 1)
+        attrs["loss_opaque_watts"] = round(loss.loss_opaque, 1)
+        attrs["loss_window_watts"] = round(loss.loss_window, 1)
+        attrs["calculation_mode"] = calc_mode
+        attrs["area_opaque_m2"] = round(area_opaque, 2)
+        attrs["area_window_m2"] = round(area_win, 2)
+
+        # R-Value Estimation (applies to opaque wall)
+        if delta_t_air_out > 5.0 and heat_flux_wall > 0.5:
+            r_si = delta_t_air_out / heat_flux_wall
+            attrs["estimated_r_value_imperial"] = round(r_si * 5.678, 1)
+            attrs["estimated_rsi"] = round(r_si, 2)
+            attrs["estimated_u_value"] = round(1.0 / r_si, 3)
+        else:
+            attrs["estimated_r_value_imperial"] = "N/A (Delta T too low)"
+
+        return SensorResult(round(heat_flux_wall, 1), attrs)
+
+    def _compute_projection(self) -> SensorResult | None:
+        """
+        MRT, T_op, heat loss and mold risk over the hourly forecast.
+
+        The room's own inputs (air temperature and humidity, shading, air speed,
+        factors) are held at their current values; only the outdoor conditions
+        follow the forecast. Indoor humidity is deliberately not derived from
+        the forecast: it is set by occupants and ventilation, so the mold risk
+        is that of the current indoor air (reported as assumed_rh) against the
+        projected wall temperature. The state is the lowest projected T_op.
+        """
+        hours = self._forecast.hours
+        inputs = self._inputs
+        t_air, rh = inputs.t_air, inputs.rh
+        terms = self._terms
+        if not hours or t_air is None or TERM_FACTORS not in terms or TERM_AIRFLOW not in terms:
+            return None
+        params, _ = terms[TERM_FACTORS]
+        v_air, _ = terms[TERM_AIRFLOW]
+
+        mrt, operative, _ = self._engine.project(
+            self._entry.entry_id,
+            params,
+            physics.MRTInputs(
+                t_air=t_air,
+                t_out_eff=t_air,
+                shading=inputs.shading,
+                radiant_boost=self._radiant_boost_stored,
+                v_air=v_air,
+            ),
+            inputs.glazing_shading,
+            [hour.t_out_eff for hour in hours],
+            [hour.wind_ms for hour in hours],
+            [hour.irradiance for hour in hours],
+            [hour.sun_azimuth for hour in hours],
+            [hour.sun_elevation for hour in hours],
+        )
+
+        area_opaque, area_win, _ = self._envelope_areas()
+        forecast: list[dict[str, Any]] = []
+        for row, hour in enumerate(hours):
+            t_surface = physics.estimated_wall_temp(t_air, hour.t_out, params.k_loss)
+            loss = physics.heat_loss(
+                t_air, hour.t_out, t_surface, v_air, area_opaque, area_win, self.window_u
+            )
+            mold_risk = None
+            if rh is not None:
+                mold_risk = round(
+                    physics.surface_relative_humidity(
+                        t_air, rh, physics.mold_wall_temp(t_air, hour.t_out, params.k_loss)
+                    ),
+                    1,
+                )
+            forecast.append(
+                {
+                    "datetime": hour.time.isoformat(),
+                    "t_out": round(hour.t_out, 1),
+                    "mrt": round(float(mrt[row]), 2),
+                    "operative": round(float(operative[row]), 2),
+                    "heat_loss_watts": round(loss.total, 1),
+                    "mold_risk": mold_risk,
+                }
+            )
+
+        low = int(operative.argmin())
+        attrs: dict[str, Any] = {
+            "weather_entity": self.entity_weather,
+            "forecast_updated": self._forecast.updated.isoformat()
+            if self._forecast.updated
+            else None,
+            "assumed_air_temp": t_air,
+            "assumed_rh": rh,
+            "min_operative_time": forecast[low]["datetime"],
+            "max_operative": round(float(operative.max()), 2),
+            "max_heat_loss_watts": max(item["heat_loss_watts"] for item in forecast),
+            "forecast": forecast,
+        }
+        if rh is not None:
+            attrs["max_mold_risk"] = max(item["mold_risk"] for item in forecast)
+        return SensorResult(round(float(operative[low]), 2), attrs)
+
+    @staticmethod
+    def _compute_pmv(inputs: RoomInputs, mrt: SensorResult | None) -> SensorResult | None:
+        """Predicted Mean Vote (PMV) from the same snapshot as the MRT."""
+        if mrt is None or mrt.native_value is None:
+            return None
+
+        t_air = mrt.attributes.get("t_air")
+        if t_air is None:
+            return None
+        v_air = mrt.attributes.get("air_speed_ms_convective", 0.1)
+        rh = inputs.rh if inputs.rh is not None else 50.0
+        clo, met = inputs.clo, inputs.met
+
+        pmv = Psychrometrics.calculate_pmv(t_air, mrt.native_value, v_air, rh, met, clo)
+
+        # PPD = 100 - 95 * exp(-0.03353*PMV^4 - 0.2179*PMV^2)
+        ppd = 100.0 - 95.0 * math.exp(-0.03353 * pow(pmv, 4) - 0.2179 * pow(pmv, 2))
+
+        attrs = {
+            "ppd_percent": round(ppd, 1),
+            "clothing_clo": clo,
+            "metabolic_met": met,
+        }
+        if abs(pmv) < 0.5:
+            attrs["comfort_category"] = "Neutral (Comfortable)"
+        elif 0.5 <= pmv < 1.5:
+            attrs["comfort_category"] = "Slightly Warm"
+        elif pmv >= 1.5:
+            attrs["comfort_category"] = "Hot"
+        elif -1.5 < pmv <= -0.5:
+            attrs["comfort_category"] = "Slightly Cool"
+        elif pmv <= -1.5:
+            attrs["comfort_category"] = "Cold"
+
+        return SensorResult(round(pmv, 2), attrs)
+
+    @staticmethod
+    def _compute_moisture_excess(
+        inputs: RoomInputs, psy: physics.PsychroState, base
+    ) -> SensorResult | None:
+        """Indoor Mixing Ratio - Outdoor Mixing Ratio (g/kg)."""
+        w_out = inputs.w_out
+        if w_out is None:
+            return None
+
+        w_in = psy.mixing_ratio
+        excess = w_in - w_out
+
+        attrs = dict(base)
+        attrs["indoor_mixing_ratio"] = round(w_in, 2)
+        attrs["outdoor_mixing_ratio"] = round(w_out, 2)
+        if excess < 0.5:
+            attrs["status"] = "Neutral (Balanced)"
+        elif excess < 1.5:
+            attrs["status"] = "Moderate Load (Occupied)"
+        else:
+            attrs["status"] = "High Load (Cooking/Shower/Humidifier)"
+
+        return SensorResult(round(excess, 2), attrs)
+
+    @staticmethod
+    def _compute_calibration(inputs: RoomInputs) -> SensorResult | None:
+        """Theoretical k_loss from the measured wall temperature."""
+        t_air, t_wall, t_out = inputs.t_air, inputs.wall_temp, inputs.t_out
+        if t_air is None or t_wall is None or t_out is None:
+            return None
+
+        # We need a significant drop to get a valid reading. > 10°C is good practice.
+        delta_t_total = t_air - t_out
+        attrs: dict[str, Any] = {
+            "t_air": t_air,
+            "t_wall": t_wall,
+            "t_out": t_out,
+            "delta_t": round(delta_t_total, 1),
+            "valid_conditions": False,
+        }
+
+        # --- RH Validation Logic ---
+        rh_air, rh_wall = inputs.rh, inputs.surface_rh
+        if rh_air is not None and rh_wall is not None:
+            vp_actual_air = Psychrometrics.calculate_vapor_pressure(t_air) * (rh_air / 100.0)
+            vp_sat_wall = Psychrometrics.calculate_vapor_pressure(t_wall)
+            vp_actual_wall = vp_sat_wall * (rh_wall / 100.0)
+
+            # Volumetric Abs Humidity (g/m3) approx
+            abs_hum_air = (1000.0 * vp_actual_air * 100.0) / (461.5 * (t_air + 273.15))
+            abs_hum_wall = (1000.0 * vp_actual_wall * 100.0) / (461.5 * (t_wall + 273.15))
+
+            # Theoretical Wall RH (if trapped air was perfect)
+            if vp_sat_wall > 0:
+                predicted_wall_rh = min(100.0, (vp_actual_air / vp_sat_wall) * 100.0)
+            else:
+                predicted_wall_rh = 100.0
+
+            abs_diff = abs_hum_wall - abs_hum_air
+            attrs["measured_surface_rh"] = rh_wall
+            attrs["predicted_surface_rh"] = round(predicted_wall_rh, 1)
+            attrs["abs_humidity_room"] = round(abs_hum_air, 2)
+            attrs["abs_humidity_surface"] = round(abs_hum_wall, 2)
+            attrs["abs_humidity_bias"] = round(abs_diff, 2)
+
+            if abs(abs_diff) < 0.5:
+                attrs["seal_quality"] = "Excellent (Airtight)"
+            elif abs(abs_diff) < 1.0:
+                attrs["seal_quality"] = "Good (Minor Leakage)"
+            else:
+                attrs["seal_quality"] = "Poor (Leaky Seal or Ingress)"
+
+        # Validity Checks
+        if inputs.sun_up:
+            attrs["status"] = "Invalid: Sun is up"
+            return SensorResult(None, attrs)
+        if delta_t_total < 10:
+            attrs["status"] = "Invalid: Low Delta T (<10°C)"
+            return SensorResult(None, attrs)
+
+        # k = (T_air - T_wall) / (Delta_T * 2.5), matching the Mold Sensor model
+        drop_internal = t_air - t_wall
+        if drop_internal < 0:
+            # Wall is warmer than air? (Heating is hitting sensor?)
+            attrs["status"] = "Invalid: Wall warmer than air"
+            return SensorResult(None, attrs)
+
+        final_k = min(1.0, max(0.0, drop_internal / (delta_t_total * 2.5)))
+        attrs["status"] = "Valid Calculation"
+        attrs["valid_conditions"] = True
+        return SensorResult(round(final_k, 3), attrs)
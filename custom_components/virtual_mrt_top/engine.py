@@ -0,0 +1,398 @@
+"""Domain-wide vectorized MRT engine for Virtual MRT."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, NamedTuple, Sequence
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, DATA_ENGINE
+from .physics import (
+    GlazingElement,
+    Irradiance,
+    MRTInputs,
+    MRTParams,
+    MRTResult,
+    estimated_wall_temp,
+    mrt_terms,
+    operative_temperature_array,
+    plane_irradiance,
+    smooth_mrt,
+    surface_normal,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ResultListener = Callable[[MRTResult, float], None]
+
+_INITIAL_CAPACITY = 8
+
+
+class _Glazing(NamedTuple):
+    """The glazing elements of one room as arrays."""
+
+    normals: np.ndarray  # (n, 3) unit normals (east, north, up)
+    areas: np.ndarray  # (n,) glass areas in m²
+
+
+@callback
+def async_get_engine(hass: HomeAssistant) -> MRTEngine:
+    """Return the engine shared by every room, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    engine = domain_data.get(DATA_ENGINE)
+    if engine is None:
+        engine = domain_data[DATA_ENGINE] = MRTEngine(hass)
+    return engine
+
+
+class MRTEngine:
+    """
+    Keeps the parameters and latest inputs of every room in NumPy arrays.
+
+    Rooms submit their inputs; all submissions made during the same event loop
+    iteration are evaluated in one vectorized pass on the next iteration, and
+    each room is then called back with its own result. Rooms without new
+    inputs are neither recomputed nor dispatched, so their smoothing state is
+    left untouched.
+
+    A room has a list of glazing elements (windows, skylights), or a single
+    vertical window facing its orientation. The elements of all evaluated
+    rooms are stacked into one array and the irradiance on each plane (beam,
+    sky diffuse and ground-reflected) is computed in the same pass, then
+    summed per room weighted by glass area and shading.
+    """
+
+    # Per-room parameters
+    _PARAMS = ("f_out", "f_win", "k_loss", "k_solar", "alpha")
+    # Per-room inputs and state
+    _INPUTS = (
+        "t_air",
+        "t_out_eff",
+        "wind_ms",
+        "ghi",
+        "dni",
+        "dhi",
+        "sun_azimuth",
+        "sun_elevation",
+        "radiant_boost",
+        "v_air",
+        "mrt_prev",
+        "last_step",
+    )
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._slots: dict[str, int] = {}
+        self._room_ids: list[str] = []
+        self._listeners: dict[str, ResultListener] = {}
+        # Glazing elements of every room, and the latest shading of each element
+        self._glazing: dict[str, _Glazing] = {}
+        self._glazing_shading: dict[str, np.ndarray] = {}
+        self._capacity = 0
+        self._arrays: dict[str, np.ndarray] = {}
+        self._dirty = np.zeros(0, dtype=bool)
+        self._tick_scheduled = False
+        self._grow(_INITIAL_CAPACITY)
+
+    @property
+    def room_count(self) -> int:
+        return len(self._room_ids)
+
+    def _grow(self, capacity: int) -> None:
+        """Resize every array to capacity, keeping the existing rows."""
+        for name in (*self._PARAMS, *self._INPUTS):
+            new = np.full(capacity, np.nan)
+            old = self._arrays.get(name)
+            if old is not None:
+                new[: self._capacity] = old
+            self._arrays[name] = new
+        dirty = np.zeros(capacity, dtype=bool)
+        dirty[: self._capacity] = self._dirty
+        self._dirty = dirty
+        self._capacity = capacity
+
+    # ------------------------------------------------------------------
+    # Room registration
+    # ------------------------------------------------------------------
+    @callback
+    def async_register(
+        self,
+        room_id: str,
+        orientation: float,
+        listener: ResultListener,
+        glazing: Sequence[GlazingElement] = (),
+    ) -> None:
+        """
+        Add a room (or replace its listener if it is already registered).
+
+        Without glazing, the room has one vertical window facing orientation.
+        """
+        if room_id not in self._slots:
+            if self.room_count == self._capacity:
+                self._grow(self._capacity * 2)
+            slot = self.room_count
+            self._slots[room_id] = slot
+            self._room_ids.append(room_id)
+            for name in (*self._PARAMS, *self._INPUTS):
+                self._arrays[name][slot] = np.nan
+            self._dirty[slot] = False
+        self._listeners[room_id] = listener
+        self._glazing_shading.pop(room_id, None)
+        if not glazing:
+            glazing = (GlazingElement(orientation),)
+        self._glazing[room_id] = _Glazing(
+            np.array([surface_normal(g.azimuth, g.tilt) for g in glazing]),
+            np.array([g.area for g in glazing], dtype=float),
+        )
+
+    @callback
+    def async_unregister(self, room_id: str) -> None:
+        """Remove a room, moving the last row into its slot."""
+        slot = self._slots.pop(room_id, None)
+        self._listeners.pop(room_id, None)
+        self._glazing.pop(room_id, None)
+        self._glazing_shading.pop(room_id, None)
+        if slot is None:
+            return
+
+        last = self.room_count - 1
+        last_id = self._room_ids.pop()
+        if slot != last:
+            for array in self._arrays.values():
+                array[slot] = array[last]
+            self._dirty[slot] = self._dirty[last]
+            self._room_ids[slot] = last_id
+            self._slots[last_id] = slot
+        self._dirty[last] = False
+
+    # ------------------------------------------------------------------
+    # Inputs
+    # ------------------------------------------------------------------
+    @callback
+    def async_submit(
+        self,
+        room_id: str,
+        params: MRTParams,
+        inputs: MRTInputs,
+        sun_azimuth: float | None,
+        sun_elevation: float | None,
+        irradiance: Irradiance,
+        glazing_shading: Sequence[float] = (),
+    ) -> None:
+        """
+        Store a room's latest parameters and inputs and schedule a tick.
+
+        The solar term uses the irradiance on the room's glazing, derived from
+        the outdoor irradiance and the sun position (inputs.radiation is not
+        used). glazing_shading holds the shading (0.0 to 1.0) of each glazing
+        element the room was registered with; without it, every element gets
+        inputs.shading.
+        """
+        slot = self._slots[room_id]
+        arrays = self._arrays
+        arrays["f_out"][slot] = params.f_out
+        arrays["f_win"][slot] = params.f_win
+        arrays["k_loss"][slot] = params.k_loss
+        arrays["k_solar"][slot] = params.k_solar
+        arrays["alpha"][slot] = params.alpha
+        arrays["t_air"][slot] = inputs.t_air
+        arrays["t_out_eff"][slot] = inputs.t_out_eff
+        arrays["wind_ms"][slot] = inputs.wind_ms
+        arrays["ghi"][slot] = irradiance.ghi
+        arrays["dni"][slot] = irradiance.dni
+        arrays["dhi"][slot] = irradiance.dhi
+        arrays["sun_azimuth"][slot] = np.nan if sun_azimuth is None else sun_azimuth
+        arrays["sun_elevation"][slot] = (
+            np.nan if sun_elevation is None else sun_elevation
+        )
+        self._glazing_shading[room_id] = self._element_shading(
+            room_id, glazing_shading, inputs.shading
+        )
+        arrays["radiant_boost"][slot] = inputs.radiant_boost
+        arrays["v_air"][slot] = inputs.v_air
+        self._dirty[slot] = True
+
+        if not self._tick_scheduled:
+            self._tick_scheduled = True
+            self.hass.loop.call_soon(self._async_tick)
+
+    # ------------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------------
+    @callback
+    def _async_tick(self) -> None:
+        """Evaluate every room with pending inputs and dispatch the results."""
+        self._tick_scheduled = False
+        count = self.room_count
+        idx = np.flatnonzero(self._dirty[:count])
+        if idx.size == 0:
+            return
+        self._dirty[idx] = False
+
+        a = {name: array[idx] for name, array in self._arrays.items()}
+        t_air = a["t_air"]
+        t_out_eff = a["t_out_eff"]
+
+        # --- Irradiance on the glazing ---
+        room_ids = [self._room_ids[slot] for slot in idx.tolist()]
+        irradiance, shaded = self._glazing_irradiance(room_ids, a)
+
+        # --- MRT Calculation ---
+        term_loss, term_solar, mrt_calc, mrt_clamped = mrt_terms(
+            t_air,
+            t_out_eff,
+            a["wind_ms"],
+            shaded,
+            1.0,
+            a["f_out"],
+            a["f_win"],
+            a["k_loss"],
+            a["k_solar"],
+            a["radiant_boost"],
+        )
+
+        # --- Smoothing (time-constant based, see physics.smooth_mrt) ---
+        now = time.monotonic()
+        mrt_final = smooth_mrt(
+            a["mrt_prev"], mrt_clamped, a["alpha"], now - a["last_step"]
+        )
+        self._arrays["mrt_prev"][idx] = mrt_final
+        self._arrays["last_step"][idx] = now
+
+        # --- Operative Temperature ---
+        operative = operative_temperature_array(t_air, mrt_final, a["v_air"])
+
+        wall_temp_est = estimated_wall_temp(t_air, t_out_eff, a["k_loss"])
+
+        for row, room_id in enumerate(room_ids):
+            listener = self._listeners.get(room_id)
+            if listener is None:
+                continue
+            result = MRTResult(
+                loss_term=float(term_loss[row]),
+                solar_term=float(term_solar[row]),
+                mrt_unclamped=float(mrt_calc[row]),
+                mrt_clamped=float(mrt_clamped[row]),
+                wall_temp_est=float(wall_temp_est[row]),
+                mrt=float(mrt_final[row]),
+                operative=float(operative[row]),
+            )
+            try:
+                listener(result, float(irradiance[row]))
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error dispatching MRT result for %s", room_id)
+
+    # ------------------------------------------------------------------
+    # Projection
+    # ------------------------------------------------------------------
+    def project(
+        self,
+        room_id: str,
+        params: MRTParams,
+        inputs: MRTInputs,
+        glazing_shading: Sequence[float],
+        t_out_eff: Sequence[float],
+        wind_ms: Sequence[float],
+        irradiance: Sequence[Irradiance],
+        sun_azimuth: Sequence[float],
+        sun_elevation: Sequence[float],
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate a room over a series of outdoor conditions (a forecast).
+
+        The room's own inputs (air temperature, shading, radiant boost, air
+        speed) are held at their current values. Each step is the clamped,
+        unsmoothed MRT, as the steps are much longer than the time constant.
+        Returns the MRT, operative temperature and irradiance on the glazing
+        per step. The room's smoothing state is not touched.
+        """
+        t_out_eff = np.asarray(t_out_eff, dtype=float)
+        wind_ms = np.asarray(wind_ms, dtype=float)
+        sun_azimuth = np.asarray(sun_azimuth, dtype=float)
+        sun_elevation = np.asarray(sun_elevation, dtype=float)
+        ghi, dni, dhi = (
+            np.array([getattr(step, part) for step in irradiance], dtype=float)
+            for part in ("ghi", "dni", "dhi")
+        )
+
+        glazing = self._glazing.get(room_id)
+        if glazing is None:
+            glazing = _Glazing(np.array([surface_normal(180.0, 90.0)]), np.ones(1))
+        # (steps, elements)
+        per_element = plane_irradiance(
+            glazing.normals[None, :, :],
+            sun_azimuth[:, None],
+            sun_elevation[:, None],
+            ghi[:, None],
+            dni[:, None],
+            dhi[:, None],
+        )
+        shading = self._element_shading(room_id, glazing_shading, inputs.shading)
+        total_area = glazing.areas.sum()
+        room_irradiance = per_element @ glazing.areas / total_area
+        shaded = per_element @ (glazing.areas * shading) / total_area
+
+        _, _, _, mrt = mrt_terms(
+            inputs.t_air,
+            t_out_eff,
+            wind_ms,
+            shaded,
+            1.0,
+            params.f_out,
+            params.f_win,
+            params.k_loss,
+            params.k_solar,
+            inputs.radiant_boost,
+        )
+        operative = operative_temperature_array(inputs.t_air, mrt, inputs.v_air)
+        return mrt, operative, room_irradiance
+
+    def _element_shading(
+        self, room_id: str, glazing_shading: Sequence[float], shading: float
+    ) -> np.ndarray:
+        """Shading per glazing element; the room's shading without a per-element list."""
+        glazing = self._glazing.get(room_id)
+        count = 1 if glazing is None else len(glazing.areas)
+        element_shading = np.asarray(glazing_shading, dtype=float)
+        if element_shading.shape != (count,):
+            element_shading = np.full(count, shading, dtype=float)
+        return element_shading
+
+    def _glazing_irradiance(
+        self, room_ids: list[str], a: dict[str, np.ndarray]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Area-weighted irradiance on the given rooms' glazing (see
+        physics.plane_irradiance), without and with shading. a holds the
+        rooms' input rows in the same order.
+        """
+        glazing = [self._glazing[room_id] for room_id in room_ids]
+        counts = [len(g.areas) for g in glazing]
+        normals = np.concatenate([g.normals for g in glazing])
+        areas = np.concatenate([g.areas for g in glazing])
+        shading = np.concatenate(
+            [
+                self._glazing_shading.get(room_id, np.ones(count))
+                for room_id, count in zip(room_ids, counts)
+            ]
+        )
+
+        # Sun position and outdoor irradiance repeated for each room's elements
+        per_element = plane_irradiance(
+            normals,
+            *(
+                np.repeat(a[name], counts)
+                for name in ("sun_azimuth", "sun_elevation", "ghi", "dni", "dhi")
+            ),
+        )
+
+        starts = np.cumsum([0, *counts[:-1]])
+        total_area = np.add.reduceat(areas, starts)
+        weighted = areas * per_element
+        irradiance = np.add.reduceat(weighted, starts) / total_area
+        shaded = np.add.reduceat(weighted * shading, starts) / total_area
+        return irradiance, shaded
@@ -0,0 +1,165 @@
+"""Shared solar ephemeris for Virtual MRT."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Callable
+
+import numpy as np
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, DATA_EPHEMERIS
+from .physics import Irradiance, SunPosition, clear_sky_irradiance, solar_position
+
+_LOGGER = logging.getLogger(__name__)
+
+# Minutes of positions kept for lookups at arbitrary timestamps (one day)
+_CACHE_SIZE = 1440
+# Days of clear-sky tables kept: the 48 h forecast horizon spans up to four
+# UTC days including today
+_CLEAR_SKY_DAYS = 4
+# Smallest changes since the last notification worth a room update
+_MIN_ANGLE_CHANGE = 0.5  # degrees of elevation or azimuth
+_MIN_IRRADIANCE_CHANGE = 5.0  # W/m² of clear-sky GHI
+
+
+@callback
+def async_get_ephemeris(hass: HomeAssistant) -> SolarEphemeris:
+    """Return the ephemeris shared by every room, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    ephemeris = domain_data.get(DATA_EPHEMERIS)
+    if ephemeris is None:
+        ephemeris = domain_data[DATA_EPHEMERIS] = SolarEphemeris(hass)
+    return ephemeris
+
+
+class SolarEphemeris:
+    """
+    Sun position at the Home Assistant location, computed in-process.
+
+    Positions are cached per minute. While any room is listening, a single
+    timer at the start of every minute refreshes the current position and
+    notifies all rooms, replacing one sun.sun subscription per room. Ticks
+    that leave the sun below the horizon, or move it (and the clear-sky
+    irradiance) by less than _MIN_ANGLE_CHANGE / _MIN_IRRADIANCE_CHANGE since
+    the last notification, notify nobody.
+
+    Clear-sky irradiance is precomputed per UTC day at minute resolution and
+    interpolated between minutes on lookup.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._cache: dict[tuple[int, float, float], SunPosition] = {}
+        self._clear_sky: dict[tuple[int, float, float, float], np.ndarray] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        # Position and clear-sky GHI of the last notification
+        self._notified: tuple[SunPosition, float] | None = None
+
+    @property
+    def position(self) -> SunPosition:
+        """Sun position for the current minute."""
+        return self.position_at(dt_util.utcnow())
+
+    def position_at(self, when: datetime) -> SunPosition:
+        """Sun position for the minute containing when (past or future)."""
+        minute = int(when.timestamp() // 60)
+        key = (minute, self.hass.config.latitude, self.hass.config.longitude)
+        position = self._cache.get(key)
+        if position is None:
+            if len(self._cache) >= _CACHE_SIZE:
+                self._cache.clear()
+            position = self._cache[key] = solar_position(
+                dt_util.utc_from_timestamp(minute * 60), key[1], key[2]
+            )
+        return position
+
+    @property
+    def clear_sky(self) -> Irradiance:
+        """Clear-sky irradiance now."""
+        return self.clear_sky_at(dt_util.utcnow())
+
+    def clear_sky_at(self, when: datetime) -> Irradiance:
+        """Clear-sky irradiance at when, interpolated from the day's table."""
+        timestamp = when.timestamp()
+        day, seconds = divmod(timestamp, 86400.0)
+        table = self._clear_sky_table(int(day))
+        minute, fraction = divmod(seconds / 60.0, 1.0)
+        row = int(minute)
+        ghi, dni, dhi = table[row] + (table[row + 1] - table[row]) * fraction
+        return Irradiance(float(ghi), float(dni), float(dhi))
+
+    def _clear_sky_table(self, day: int) -> np.ndarray:
+        """(1441, 3) GHI/DNI/DHI for every minute of the UTC day, end inclusive."""
+        config = self.hass.config
+        key = (day, config.latitude, config.longitude, config.elevation or 0)
+        table = self._clear_sky.get(key)
+        if table is None:
+            if len(self._clear_sky) >= _CLEAR_SKY_DAYS:
+                self._clear_sky.pop(next(iter(self._clear_sky)))
+            start = day * 86400
+            day_of_year = dt_util.utc_from_timestamp(start).timetuple().tm_yday
+            table = np.empty((1441, 3))
+            for minute in range(1441):
+                sun = solar_position(
+                    dt_util.utc_from_timestamp(start + minute * 60), key[1], key[2]
+                )
+                clear = clear_sky_irradiance(sun.elevation, day_of_year, key[3])
+                table[minute] = (clear.ghi, clear.dni, clear.dhi)
+            self._clear_sky[key] = table
+        return table
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call listener every minute with a new position. Returns the remover."""
+        self._listeners.append(listener)
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_utc_time_change(
+                self.hass, self._async_tick, second=0
+            )
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners and self._unsub_timer is not None:
+                self._unsub_timer()
+                self._unsub_timer = None
+                self._notified = None
+
+        return remove_listener
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Compute the position for the new minute and notify every room if it moved."""
+        position = self.position_at(now)
+        ghi = self.clear_sky_at(now).ghi
+        if not self._moved(position, ghi):
+            return
+        self._notified = (position, ghi)
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error dispatching sun position update")
+
+    def _moved(self, position: SunPosition, ghi: float) -> bool:
+        """True if position/ghi differ meaningfully from the last notification."""
+        if self._notified is None:
+            return True
+        last, last_ghi = self._notified
+        if position.above_horizon != last.above_horizon:
+            return True
+        if not position.above_horizon:
+            return False
+        azimuth_change = (position.azimuth - last.azimuth + 180.0) % 360.0 - 180.0
+        return (
+            abs(position.elevation - last.elevation) >= _MIN_ANGLE_CHANGE
+            or abs(azimuth_change) >= _MIN_ANGLE_CHANGE
+            or abs(ghi - last_ghi) >= _MIN_IRRADIANCE_CHANGE
+        )
@@ -0,0 +1,212 @@
+"""Shared weather forecasts for Virtual MRT projections."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from . import physics
+from .const import DOMAIN, DATA_FORECAST
+from .ephemeris import async_get_ephemeris
+from .units import KIND_SPEED, KIND_TEMPERATURE, UnitNormalizer
+
+_LOGGER = logging.getLogger(__name__)
+
+# How often the hourly forecast is fetched, and how far ahead it is used
+FORECAST_REFRESH_INTERVAL = timedelta(minutes=30)
+FORECAST_HORIZON = timedelta(hours=48)
+# First retry after a failed fetch, doubled on each failure until it
+# reaches the refresh interval
+FORECAST_RETRY_DELAY = timedelta(seconds=30)
+
+ForecastListener = Callable[[], None]
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastHour:
+    """Outdoor conditions of one forecast hour, in model units."""
+
+    time: datetime
+    t_out: float
+    rh_out: float | None
+    t_out_eff: float
+    wind_ms: float
+    irradiance: physics.Irradiance
+    sun_azimuth: float
+    sun_elevation: float
+
+
+@callback
+def async_get_forecast(hass: HomeAssistant, weather_entity: str) -> WeatherForecast:
+    """
+    Return the forecast of this weather entity, creating it on first use.
+    Subscribe right away: a forecast is dropped when its last listener leaves.
+    """
+    forecasts = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_FORECAST, {})
+    forecast = forecasts.get(weather_entity)
+    if forecast is None:
+        forecast = forecasts[weather_entity] = WeatherForecast(hass, weather_entity)
+    return forecast
+
+
+class WeatherForecast:
+    """
+    Hourly forecast of one weather entity, shared by every room using it.
+
+    While any room is listening, the forecast is fetched with the
+    weather.get_forecasts service every FORECAST_REFRESH_INTERVAL. Each fetch
+    is converted once into outdoor conditions per hour (effective temperature,
+    wind, clear-sky radiation attenuated by the forecast clouds and split
+    into direct and diffuse, sun position), and the rooms are notified to
+    project their model over it. A failed fetch (e.g. the weather integration
+    is not loaded yet) is retried with a backoff from FORECAST_RETRY_DELAY.
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        self.hass = hass
+        self.entity_id = entity_id
+        self.hours: tuple[ForecastHour, ...] = ()
+        self.updated: datetime | None = None
+        self._ephemeris = async_get_ephemeris(hass)
+        self._units = UnitNormalizer()
+        self._listeners: list[ForecastListener] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_retry: CALLBACK_TYPE | None = None
+        self._retry_delay = FORECAST_RETRY_DELAY
+        self._warned = False
+
+    @callback
+    def async_add_listener(self, listener: ForecastListener) -> CALLBACK_TYPE:
+        """Subscribe a room. Returns the callable that unsubscribes it."""
+        if not self._listeners:
+            self._unsub_timer = async_track_time_interval(
+                self.hass, self._async_refresh, FORECAST_REFRESH_INTERVAL
+            )
+            self.hass.async_create_task(self._async_refresh())
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners:
+                self._async_stop()
+
+        return remove_listener
+
+    @callback
+    def _async_stop(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._cancel_retry()
+        forecasts = self.hass.data.get(DOMAIN, {}).get(DATA_FORECAST, {})
+        if forecasts.get(self.entity_id) is self:
+            forecasts.pop(self.entity_id)
+
+    @callback
+    def _cancel_retry(self) -> None:
+        if self._unsub_retry:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    async def _async_refresh(self, _now: datetime | None = None) -> None:
+        """Fetch the hourly forecast and hand it to every room."""
+        self._cancel_retry()
+        try:
+            response = await self.hass.services.async_call(
+                "weather",
+                "get_forecasts",
+                {"type": "hourly"},
+                target={"entity_id": self.entity_id},
+                blocking=True,
+                return_response=True,
+            )
+        except HomeAssistantError as err:
+            if not self._warned:
+                _LOGGER.warning(
+                    "Hourly forecast of %s unavailable, no projection: %s",
+                    self.entity_id,
+                    err,
+                )
+                self._warned = True
+            if self._listeners and self._retry_delay < FORECAST_REFRESH_INTERVAL:
+                self._unsub_retry = async_call_later(
+                    self.hass, self._retry_delay, self._async_refresh
+                )
+                self._retry_delay *= 2
+            return
+        self._retry_delay = FORECAST_RETRY_DELAY
+        if not self._listeners:
+            return
+
+        items = (response or {}).get(self.entity_id, {}).get("forecast") or []
+        self.hours = self._convert(items)
+        self.updated = dt_util.utcnow()
+        self._warned = False
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error dispatching forecast of %s", self.entity_id)
+
+    def _convert(self, items: list[dict[str, Any]]) -> tuple[ForecastHour, ...]:
+        """Forecast items (in the entity's units) -> conditions per hour."""
+        weather = self.hass.states.get(self.entity_id)
+        attributes = weather.attributes if weather else {}
+        temperature_unit = attributes.get("temperature_unit")
+        wind_speed_unit = attributes.get("wind_speed_unit")
+
+        now = dt_util.utcnow()
+        end = now + FORECAST_HORIZON
+        hours: list[ForecastHour] = []
+        for item in items:
+            when = dt_util.parse_datetime(str(item.get("datetime", "")))
+            temperature = item.get("temperature")
+            if when is None or temperature is None:
+                continue
+            when = dt_util.as_utc(when)
+            if when < now - timedelta(hours=1) or when > end:
+                continue
+            try:
+                t_out = float(temperature)
+                rh_out = item.get("humidity")
+                rh_out = None if rh_out is None else float(rh_out)
+                wind = float(item.get("wind_speed") or 0.0)
+                cloud = item.get("cloud_coverage")
+                cloud = 50.0 if cloud is None else float(cloud)
+                precipitation = float(item.get("precipitation") or 0.0)
+            except (TypeError, ValueError):
+                continue
+            t_out = self._units.convert(
+                self.entity_id, "temperature", KIND_TEMPERATURE, temperature_unit, t_out
+            )
+            wind = self._units.convert(
+                self.entity_id, "wind_speed", KIND_SPEED, wind_speed_unit, wind
+            )
+
+            t_app = physics.apparent_temperature(t_out, rh_out, wind)
+            t_out_eff, _ = physics.effective_outdoor_temp(t_out, t_app)
+            is_raining = precipitation > 0.0 or physics.is_precipitation(
+                item.get("condition")
+            )
+            sun = self._ephemeris.position_at(when)
+            radiation = physics.estimate_radiation(
+                self._ephemeris.clear_sky_at(when).ghi, cloud, is_raining
+            )
+            irradiance = physics.split_irradiance(
+                radiation, sun.elevation, when.timetuple().tm_yday
+            )
+            hours.append(
+                ForecastHour(
+                    when, t_out, rh_out, t_out_eff, wind, irradiance, sun.azimuth, sun.elevation
+                )
+            )
+        return tuple(hours)
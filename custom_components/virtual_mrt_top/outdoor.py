@@ -0,0 +1,416 @@
+"""Shared outdoor conditions for Virtual MRT."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.util import dt as dt_util
+
+from . import physics
+from .const import DOMAIN, DATA_OUTDOOR
+from .ephemeris import async_get_ephemeris
+from .physics import SunPosition
+from .tracking import async_get_state_index
+from .units import (
+    KIND_IRRADIANCE,
+    KIND_PRESSURE,
+    KIND_SPEED,
+    KIND_TEMPERATURE,
+    SENSOR_ATTRIBUTES,
+    async_get_state_parser,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Parts of the outdoor conditions; listeners are told which ones changed
+OUTDOOR_AIR = "air"
+OUTDOOR_PRESSURE = "pressure"
+OUTDOOR_SKY = "sky"
+OUTDOOR_SUN = "sun"
+ALL_PARTS = frozenset({OUTDOOR_AIR, OUTDOOR_PRESSURE, OUTDOOR_SKY, OUTDOOR_SUN})
+
+# Weather entity attributes the hub reads. Changes to any other attribute
+# (forecasts, visibility, ozone, ...) do not refresh the conditions.
+WEATHER_ATTRIBUTES = frozenset(
+    {
+        "temperature",
+        "apparent_temperature",
+        "temperature_unit",
+        "humidity",
+        "wind_speed",
+        "wind_speed_unit",
+        "pressure",
+        "pressure_unit",
+        "cloud_coverage",
+        "uv_index",
+    }
+)
+
+OutdoorListener = Callable[[frozenset[str]], None]
+
+
+class OutdoorSources(NamedTuple):
+    """The weather entity and dedicated outdoor sensors of a room."""
+
+    weather: str
+    temperature: str | None = None
+    humidity: str | None = None
+    wind_speed: str | None = None
+    pressure: str | None = None
+    uv_index: str | None = None
+    precipitation: str | None = None
+    solar: str | None = None
+
+
+@dataclass
+class OutdoorConditions:
+    """Outdoor values derived once per change and shared by all rooms."""
+
+    # --- Air ---
+    t_out: float | None = None
+    rh_out: float | None = None
+    outdoor_source: str = "dedicated_sensors"
+    wind_ms: float = 0.0
+    t_out_eff: float | None = None
+    outdoor_attrs: dict[str, Any] = field(default_factory=dict)
+    # --- Pressure (station) and outdoor psychrometrics at that pressure ---
+    pressure: float = 1013.25
+    enthalpy: float | None = None
+    mixing_ratio: float | None = None
+    # --- Sky and Sun ---
+    irradiance: physics.Irradiance = physics.Irradiance(0.0, 0.0, 0.0)
+    radiation_attrs: dict[str, Any] = field(default_factory=dict)
+    sun: SunPosition | None = None
+
+
+@callback
+def async_get_outdoor_hub(hass: HomeAssistant, sources: OutdoorSources) -> OutdoorHub:
+    """
+    Return the hub for these sources, creating it on first use. Subscribe
+    right away: a hub is dropped when its last listener leaves.
+    """
+    hubs = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_OUTDOOR, {})
+    hub = hubs.get(sources)
+    if hub is None:
+        hub = hubs[sources] = OutdoorHub(hass, sources)
+    return hub
+
+
+class OutdoorHub:
+    """
+    Outdoor conditions for one set of sources.
+
+    Rooms pointing at the same weather entity and outdoor sensors share a hub:
+    it subscribes to those entities (and the solar ephemeris) once, derives
+    the effective outdoor temperature, pressure, outdoor psychrometrics and
+    estimated radiation once per change, and tells every room which parts
+    changed. The hub is dropped when its last room stops listening.
+    """
+
+    def __init__(self, hass: HomeAssistant, sources: OutdoorSources) -> None:
+        self.hass = hass
+        self.sources = sources
+        self.conditions = OutdoorConditions()
+        self._ephemeris = async_get_ephemeris(hass)
+        self._states: dict[str, State | None] = {}
+        self._parser = async_get_state_parser(hass)
+        self._elevation: float | None = None
+        self._elevation_factor = 1.0
+        self._listeners: list[OutdoorListener] = []
+        self._unsub_tracker: CALLBACK_TYPE | None = None
+        self._unsub_sun: CALLBACK_TYPE | None = None
+
+        # Entity -> parts it feeds
+        input_parts: dict[str, set[str]] = {}
+        for entity_id, parts in (
+            (sources.weather, (OUTDOOR_AIR, OUTDOOR_PRESSURE, OUTDOOR_SKY)),
+            (sources.temperature, (OUTDOOR_AIR,)),
+            (sources.humidity, (OUTDOOR_AIR,)),
+            (sources.wind_speed, (OUTDOOR_AIR,)),
+            (sources.pressure, (OUTDOOR_PRESSURE,)),
+            (sources.uv_index, (OUTDOOR_SKY,)),
+            (sources.precipitation, (OUTDOOR_SKY,)),
+            (sources.solar, (OUTDOOR_SKY,)),
+        ):
+            if entity_id:
+                input_parts.setdefault(entity_id, set()).update(parts)
+        self._input_parts = {
+            entity_id: frozenset(parts) for entity_id, parts in input_parts.items()
+        }
+        # Entity -> attributes read from it
+        self._input_attributes = {
+            entity_id: (
+                WEATHER_ATTRIBUTES if entity_id == sources.weather else SENSOR_ATTRIBUTES
+            )
+            for entity_id in self._input_parts
+        }
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+    @callback
+    def async_add_listener(self, listener: OutdoorListener) -> CALLBACK_TYPE:
+        """Subscribe a room. Returns the callable that unsubscribes it."""
+        if not self._listeners:
+            self._async_start()
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners:
+                self._async_stop()
+
+        return remove_listener
+
+    @callback
+    def _async_start(self) -> None:
+        for entity_id in self._input_parts:
+            self._states[entity_id] = self.hass.states.get(entity_id)
+        self._unsub_tracker = async_get_state_index(self.hass).async_subscribe(
+            self._input_parts, self._handle_state_change, self._input_attributes
+        )
+        self._unsub_sun = self._ephemeris.async_add_listener(self._handle_sun_update)
+        self._refresh(ALL_PARTS)
+
+    @callback
+    def _async_stop(self) -> None:
+        if self._unsub_tracker:
+            self._unsub_tracker()
+            self._unsub_tracker = None
+        if self._unsub_sun:
+            self._unsub_sun()
+            self._unsub_sun = None
+        self._states.clear()
+        hubs = self.hass.data.get(DOMAIN, {}).get(DATA_OUTDOOR, {})
+        if hubs.get(self.sources) is self:
+            hubs.pop(self.sources)
+
+    @callback
+    def _handle_state_change(
+        self, entity_id: str, new_state: State | None, parts: frozenset[str]
+    ) -> None:
+        self._states[entity_id] = new_state
+        self._refresh(parts)
+        self._notify(parts)
+
+    @callback
+    def _handle_sun_update(self) -> None:
+        parts = frozenset({OUTDOOR_SUN, OUTDOOR_SKY})
+        self._refresh(parts)
+        self._notify(parts)
+
+    def _notify(self, parts: frozenset[str]) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(parts)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error dispatching outdoor conditions")
+
+    # ------------------------------------------------------------------
+    # Derivation
+    # ------------------------------------------------------------------
+    def _state(self, entity_id: str | None) -> State | None:
+        if not entity_id:
+            return None
+        return self._states.get(entity_id)
+
+    def _refresh(self, parts: frozenset[str]) -> None:
+        """Re-derive the given parts from the cached input states."""
+        conditions = self.conditions
+        if OUTDOOR_PRESSURE in parts:
+            conditions.pressure = self._read_pressure()
+        if OUTDOOR_AIR in parts:
+            self._read_air()
+        if OUTDOOR_AIR in parts or OUTDOOR_PRESSURE in parts:
+            self._derive_psychrometrics()
+        if OUTDOOR_SUN in parts:
+            conditions.sun = self._ephemeris.position
+        if OUTDOOR_SKY in parts or OUTDOOR_SUN in parts:
+            self._derive_radiation()
+
+    def _read_pressure(self) -> float:
+        """Dedicated sensor (trusted as absolute pressure) -> Weather Entity."""
+        value = self._parser.state(self._state(self.sources.pressure), KIND_PRESSURE)
+        if value is None:
+            value = self._station_pressure(self._state(self.sources.weather))
+        return value
+
+    def _station_pressure(self, weather: State | None) -> float:
+        """
+        Weather Entity pressure (Assumed to be Sea-Level Pressure), or the
+        1013.25 default, corrected for the elevation to station pressure.
+        """
+        pressure_val = self._parser.attr(
+            weather, "pressure", "pressure_unit", KIND_PRESSURE, 1013.25
+        )
+
+        # Apply Elevation Correction (the factor only changes with the home elevation)
+        elevation = self.hass.config.elevation or 0
+        if elevation != self._elevation:
+            self._elevation = elevation
+            self._elevation_factor = 1.0
+            if elevation > 0:
+                # Simplified ISA approximation (using T_std=15C):
+                # Factor = (1 - (0.0000225577 * elevation)) ^ 5.25588
+                self._elevation_factor = (1 - (0.0000225577 * elevation)) ** 5.25588
+
+        return round(pressure_val * self._elevation_factor, 2)
+
+    def _read_air(self) -> None:
+        """Outdoor temperature, humidity and wind, then the effective temperature."""
+        conditions = self.conditions
+        sources = self.sources
+        parser = self._parser
+        weather = self._state(sources.weather)
+
+        def weather_temp(attr: str) -> float | None:
+            return parser.attr(weather, attr, "temperature_unit", KIND_TEMPERATURE)
+
+        # --- Outdoor (Priority: Dedicated Sensors -> Weather Fallback) ---
+        if sources.temperature or sources.humidity:
+            t_out = parser.state(self._state(sources.temperature), KIND_TEMPERATURE)
+            rh_out = parser.state(self._state(sources.humidity))
+            outdoor_source = "dedicated_sensors"
+            if (t_out is None or rh_out is None) and weather:
+                if t_out is None:
+                    t_out = weather_temp("temperature")
+                if rh_out is None:
+                    rh_out = parser.attr(weather, "humidity")
+                outdoor_source = "weather_entity"
+        else:
+            t_out = weather_temp("temperature")
+            rh_out = parser.attr(weather, "humidity")
+            outdoor_source = "weather_entity" if weather else "dedicated_sensors"
+
+        # --- Wind (Dedicated Sensor -> Weather Entity), in m/s ---
+        wind = parser.state(self._state(sources.wind_speed), KIND_SPEED)
+        if wind is None:
+            wind = parser.attr(weather, "wind_speed", "wind_speed_unit", KIND_SPEED, 0.0)
+
+        conditions.t_out = t_out
+        conditions.rh_out = rh_out
+        conditions.outdoor_source = outdoor_source
+        conditions.wind_ms = wind
+
+        attrs: dict[str, Any] = {
+            "wind_ms": round(wind, 2),
+            "wind_kmh": round(wind * 3.6, 2),
+            "wind_source": "weather_entity",
+        }
+        if t_out is None:
+            conditions.t_out_eff = None
+            conditions.outdoor_attrs = attrs
+            return
+
+        # We want the "Feels Like" temp because that drives heat loss better than dry bulb.
+        # Try to calculate locally first (Most Accurate)
+        t_app = physics.apparent_temperature(t_out, rh_out, wind)
+        t_out_source = "calculated_local_aat"
+        if t_app is None:
+            # Fallback to weather entity attribute
+            t_app = weather_temp("apparent_temperature")
+            t_out_source = "weather_entity_attr"
+
+        # Use the lower of the two (Conservative for heating: Wind Chill matters)
+        t_out_eff, used_apparent = physics.effective_outdoor_temp(t_out, t_app)
+        if not used_apparent:
+            t_out_source = "dry_bulb_clamped"
+        attrs["t_out_eff"] = round(t_out_eff, 2)
+        attrs["t_out_eff_source"] = t_out_source
+        conditions.t_out_eff = t_out_eff
+        conditions.outdoor_attrs = attrs
+
+    def _derive_psychrometrics(self) -> None:
+        """Outdoor enthalpy (kJ/kg) and mixing ratio (g/kg)."""
+        conditions = self.conditions
+        t_out, rh_out = conditions.t_out, conditions.rh_out
+        if t_out is None or rh_out is None:
+            conditions.enthalpy = None
+            conditions.mixing_ratio = None
+            return
+        psychro = physics.psychro_state(t_out, rh_out, conditions.pressure)
+        conditions.enthalpy = psychro.enthalpy
+        conditions.mixing_ratio = psychro.mixing_ratio
+
+    def _derive_radiation(self) -> None:
+        """
+        Global radiation from the solar sensor or the clear-sky model, split
+        into its direct and diffuse parts for the glazing planes.
+        """
+        sources = self.sources
+        parser = self._parser
+        weather = self._state(sources.weather)
+        attrs: dict[str, Any] = {}
+
+        # --- Clouds/UV/Rain ---
+        cloud = parser.attr(weather, "cloud_coverage")
+        cloud_source = "weather_entity"
+        if cloud is None:
+            cloud = 50.0
+            cloud_source = "fallback"
+        attrs["cloud_coverage"] = cloud
+        attrs["cloud_source"] = cloud_source
+
+        # UV (Dedicated Sensor -> Weather Entity -> Fallback)
+        uv = parser.state(self._state(sources.uv_index))
+        uv_source = "sensor"
+        if uv is None:
+            uv = parser.attr(weather, "uv_index")
+            uv_source = "fallback" if uv is None else "weather_entity"
+        attrs["uv_index"] = uv if uv is not None else 0.0
+        attrs["uv_source"] = uv_source
+
+        # 1. Try Dedicated Sensor (Rate > 0) 2. Weather Entity State (String match)
+        rain_rate = parser.state(self._state(sources.precipitation))
+        if rain_rate is not None:
+            is_raining = rain_rate > 0.0
+            rain_source = "sensor"
+        else:
+            condition = weather.state if weather else None
+            is_raining = physics.is_precipitation(condition)
+            rain_source = (
+                "weather_entity_condition_string"
+                if condition is not None
+                else "fallback"
+            )
+        attrs["rain_multiplier"] = physics.rain_multiplier(is_raining)
+        attrs["rain_source"] = rain_source
+
+        sun = self.conditions.sun
+        elevation = sun.elevation if sun else -90.0
+        attrs["daylight_factor"] = round(physics.daylight_factor(elevation), 3)
+        now = dt_util.utcnow()
+        clear = self._ephemeris.clear_sky_at(now)
+        attrs["clear_sky_ghi"] = round(clear.ghi, 1)
+        attrs["clear_sky_dni"] = round(clear.dni, 1)
+        attrs["clear_sky_dhi"] = round(clear.dhi, 1)
+
+        # --- Radiation ---
+        solar = parser.state(self._state(sources.solar), KIND_IRRADIANCE)
+        if solar is not None:
+            rad_source = "sensor"
+            rad_val = solar
+            if rad_val > 1300:
+                _LOGGER.warning(
+                    "Solar sensor value (%s W/m²) exceeds physical maximum. Using reported value.",
+                    rad_val,
+                )
+        else:
+            # Clear-sky global irradiance, attenuated by clouds and rain
+            rad_val = physics.estimate_radiation(clear.ghi, cloud, is_raining)
+            rad_source = "clear_sky_model"
+        rad_final = max(0.0, rad_val)
+        irradiance = physics.split_irradiance(
+            rad_final, elevation, now.timetuple().tm_yday
+        )
+        attrs["radiation"] = round(rad_final, 1)
+        attrs["radiation_dni"] = round(irradiance.dni, 1)
+        attrs["radiation_dhi"] = round(irradiance.dhi, 1)
+        attrs["radiation_source"] = rad_source
+        self.conditions.irradiance = irradiance
+        self.conditions.radiation_attrs = attrs
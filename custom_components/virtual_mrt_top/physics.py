@@ -0,0 +1,1336 @@
+"""
+Physics core for Virtual MRT.
+
+Pure functions over plain numbers (the psychrometrics also over NumPy
+arrays): no Home Assistant imports and no relative imports, so the module can
+be loaded on its own for benchmarks, offline replays and bulk what-if runs.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Radiant Heat Transfer Coefficient for a seated, sedentary occupant (W/(m^2*K))
+H_RADIATIVE = 4.7
+# Air speed at or below which only natural convection is assumed (m/s)
+STILL_AIR_LIMIT = 0.1
+# ASHRAE simplified convective coefficient: hc = 3.1 in still air, else
+# 3.1 + 5.6 * v^0.6 (W/(m^2*K))
+HC_NATURAL = 3.1
+HC_FORCED = 5.6
+HC_FORCED_EXPONENT = 0.6
+# Time step (s) a smoothing alpha refers to: alpha is the fraction of the gap
+# to the target closed after this many seconds, whatever the update rate
+ALPHA_REFERENCE_STEP = 30.0
+# Gas constants of dry air and water vapour (J/(kg·K))
+R_DRY_AIR = 287.058
+R_WATER_VAPOR = 461.495
+
+
+class Psychrometrics:
+    """Helper for thermodynamic calculations."""
+
+    @staticmethod
+    def calculate_pmv(t_air, t_mrt, v_air, rh, met, clo):
+        """
+        Calculate PMV (Predicted Mean Vote) using ISO 7730 / ASHRAE 55.
+        """
+        # 1. Convert Inputs
+        ta = t_air
+        tr = t_mrt
+        vel = max(0.1, v_air)  # Min velocity for stability
+        rh_frac = rh / 100.0
+
+        # Metabolism: 1 met = 58.15 W/m2
+        m = met * 58.15
+
+        # External Work (assume 0 for home/office)
+        w = 0.0
+
+        # Internal Heat Production
+        mw = m - w
+
+        # Clothing Insulation: 1 clo = 0.155 m2K/W
+        icl = clo * 0.155
+
+        # Clothing Area Factor (fcl)
+        if icl <= 0.078:
+            fcl = 1.0 + (1.29 * icl)
+        else:
+            fcl = 1.05 + (0.645 * icl)
+
+        # Vapor Pressure (Pa)
+        # Use existing helper but convert hPa -> Pa
+        vp_hpa = Psychrometrics.calculate_vapor_pressure(ta) * rh_frac
+        pa = vp_hpa * 100.0
+
+        # 2. Iterative Calculation for Clothing Surface Temp (t_cl)
+        # Starting guess: t_cl = t_air
+        t_cl = ta
+        t_abs = ta + 273.15
+        tr_abs = tr + 273.15
+
+        # Iteration variables
+        hc = 12.1 * math.sqrt(vel)  # Convective heat transfer coef
+        n_iter = 0
+        eps = 0.00015  # Stopping tolerance
+
+        while n_iter < 150:
+            t_cl_old = t_cl
+            t_cl_abs = t_cl + 273.15
+
+            # Radiative Heat Transfer
+            # h_r = 4 * sigma * f_cl ... simplified for linearization
+            # We compute terms directly in balance equation below
+
+            # Convection coeff (hc) depends on T_cl vs T_air (Natural vs Forced)
+            hc_forced = 12.1 * math.sqrt(vel)
+            hc_natural = 2.38 * abs(t_cl - ta) ** 0.25
+            hc = max(hc_forced, hc_natural)
+
+            # Heat Balance Equation terms
+            # Radiation Term: 3.96*10^-8 * fcl * (Tcl^4 - Tr^4)
+            rad = 3.96 * 10**-8 * fcl * (t_cl_abs**4 - tr_abs**4)
+
+            # Convection Term: fcl * hc * (Tcl - Ta)
+            conv = fcl * hc * (t_cl - ta)
+
+            # T_cl new estimate
+            # T_cl = 35.7 - 0.028(M-W) - I_cl * (Rad + Conv)
+            t_cl_new = (35.7 - 0.028 * mw) - (icl * (rad + conv))
+
+            # Dampening
+            t_cl = (t_cl_new + t_cl_old) / 2.0
+
+            if abs(t_cl - t_cl_old) < eps:
+                break
+            n_iter += 1
+
+        # 3. Calculate Heat Loss Components (ISO 7730)
+        # Skin diffusion
+        hl1 = 3.05 * 0.001 * (5733 - (6.99 * mw) - pa)
+        # Sweat (Latent)
+        if mw > 58.15:
+            hl2 = 0.42 * (mw - 58.15)
+        else:
+            hl2 = 0.0
+        # Latent Respiration
+        hl3 = 1.7 * 0.00001 * m * (5867 - pa)
+        # Dry Respiration
+        hl4 = 0.0014 * m * (34 - ta)
+        # Radiation
+        hl5 = 3.96 * 10**-8 * fcl * ((t_cl + 273.15) ** 4 - tr_abs**4)
+        # Convection
+        hl6 = fcl * hc * (t_cl - ta)
+
+        # 4. Final PMV Calc
+        ts = 0.303 * math.exp(-0.036 * m) + 0.028
+        pmv = ts * (mw - hl1 - hl2 - hl3 - hl4 - hl5 - hl6)
+
+        return max(-3.5, min(3.5, pmv))  # Clamp to valid range
+
+    @staticmethod
+    def calculate_humidity_ratio(vp_actual: float, pressure_hpa: float) -> float:
+        """
+        Calculate Mixing Ratio (W) in g_water / kg_dry_air.
+        """
+        # W = 0.622 * e / (P - e), kg/kg -> g/kg
+        dry = pressure_hpa - vp_actual
+        if dry <= 0:
+            return 0.0
+        return 0.622 * vp_actual / dry * 1000.0
+
+    @staticmethod
+    def calculate_air_density(
+        t_air: float, vp_actual: float, pressure_hpa: float
+    ) -> float:
+        """
+        Calculate Moist Air Density in kg/m³.
+        """
+        t_kelvin = t_air + 273.15
+        p_pa = pressure_hpa * 100.0
+        # Vapour pressure back from the guarded mixing ratio (none where P <= e)
+        w = Psychrometrics.calculate_humidity_ratio(vp_actual, pressure_hpa) / 1000.0
+        e_pa = p_pa * w / (0.622 + w)
+        return ((p_pa - e_pa) / (R_DRY_AIR * t_kelvin)) + (e_pa / (R_WATER_VAPOR * t_kelvin))
+
+    @staticmethod
+    def calculate_vapor_pressure(t_air: float) -> float:
+        """
+        Calculate saturation vapor pressure (hPa) with the selected
+        formulation (Magnus by default, see set_saturation_formula).
+        """
+        return _svp_scalar(t_air)
+
+    @staticmethod
+    def calculate_dew_point(t_air: float, rh: float) -> float:
+        """Calculate Dew Point (°C)."""
+        if rh <= 0:
+            return -50.0  # Safety
+        return _svp_inverse_scalar(_svp_scalar(t_air) * (rh / 100.0))
+
+    @staticmethod
+    def calculate_frost_point(t_air: float, dew_point: float) -> float:
+        """
+        Calculate Frost Point (°C).
+        Above 0°C, Frost Point = Dew Point.
+        Below 0°C, Frost Point > Dew Point (saturation over ice).
+        """
+        if dew_point > 0:
+            return dew_point
+        if _svp_formula == SVP_HYLAND_WEXLER:
+            return _invert_svp(
+                svp_hyland_wexler_ice, svp_hyland_wexler_water(dew_point), math.log
+            )
+        return dew_point - 0.1 * (t_air - dew_point)  # Heuristic adjustment
+
+    @staticmethod
+    def calculate_enthalpy(
+        t_air: float, rh: float, pressure_hpa: float = 1013.25
+    ) -> float:
+        """
+        Calculate Air Enthalpy (kJ/kg).
+        Requires Pressure in hPa (mbar).
+        """
+        vp_actual = _svp_scalar(t_air) * (rh / 100.0)
+        # Lower pressure (altitude) means a higher W, in kg/kg
+        w = Psychrometrics.calculate_humidity_ratio(vp_actual, pressure_hpa) / 1000.0
+        # H = 1.006*T + W*(2501 + 1.86*T)
+        return (1.006 * t_air) + (w * (2501 + 1.86 * t_air))
+
+    @staticmethod
+    def calculate_humidex(t_air: float, dew_point: float) -> float:
+        """Calculate Humidex (°C)."""
+        # Humidex = T + 0.5555 * (e - 10), e from the dew point (inverse Magnus)
+        e = 6.11 * math.exp(5417.7530 * ((1 / 273.16) - (1 / (273.15 + dew_point))))
+        return t_air + 0.5555 * (e - 10)
+
+
+# ----------------------------------------------------------------------
+# Psychrometrics over arrays
+# ----------------------------------------------------------------------
+# NumPy versions of the Psychrometrics formulas (which stay pure Python for
+# the per-room scalar path). Every argument may be a scalar or a NumPy array;
+# arrays broadcast against each other, so months of recorder rows for many
+# rooms are evaluated in one pass.
+def vapor_pressure(t_air: ArrayLike) -> np.ndarray:
+    """Saturation vapour pressure (hPa) with the selected formulation."""
+    return _svp_array(np.asarray(t_air, dtype=float))
+
+
+def dew_point(t_air: ArrayLike, rh: ArrayLike) -> np.ndarray:
+    """
+    Dew point (°C): where the selected formulation over water gives the
+    actual vapour pressure; -50 where RH is not positive.
+    """
+    t_air = np.asarray(t_air, dtype=float)
+    rh = np.asarray(rh, dtype=float)
+    valid = rh > 0
+    # RH masked so the log in the inversion stays finite
+    vp_actual = _svp_array(t_air) * (np.where(valid, rh, 100.0) / 100.0)
+    return np.where(valid, _svp_inverse(vp_actual), -50.0)
+
+
+def frost_point(t_air: ArrayLike, dew_point: ArrayLike) -> np.ndarray:
+    """
+    Frost point (°C): the dew point above 0 °C. Below it, Hyland-Wexler is
+    inverted over ice; Magnus has no ice phase, so the dew point gets a
+    heuristic correction instead.
+    """
+    t_air = np.asarray(t_air, dtype=float)
+    dew_point = np.asarray(dew_point, dtype=float)
+    if _svp_formula == SVP_HYLAND_WEXLER:
+        frost = _invert_svp(
+            svp_hyland_wexler_ice_array, svp_hyland_wexler_water_array(dew_point), np.log
+        )
+    else:
+        frost = dew_point - 0.1 * (t_air - dew_point)
+    return np.where(dew_point > 0, dew_point, frost)
+
+
+def humidity_ratio(vp_actual: ArrayLike, pressure_hpa: ArrayLike) -> np.ndarray:
+    """Mixing ratio (g water / kg dry air); 0 where P <= e."""
+    vp_actual = np.asarray(vp_actual, dtype=float)
+    dry = np.asarray(pressure_hpa, dtype=float) - vp_actual
+    # W = 0.622 * e / (P - e), kg/kg -> g/kg (P <= e divides by inf)
+    return 0.622 * vp_actual / np.where(dry > 0, dry, np.inf) * 1000.0
+
+
+def absolute_humidity(t_air: ArrayLike, vp_actual: ArrayLike) -> np.ndarray:
+    """Volumetric absolute humidity (g/m³), pressure independent approximation."""
+    return (1000.0 * np.asarray(vp_actual, dtype=float) * 100.0) / (
+        461.5 * (np.asarray(t_air, dtype=float) + 273.15)
+    )
+
+
+def air_density(
+    t_air: ArrayLike, vp_actual: ArrayLike, pressure_hpa: ArrayLike
+) -> np.ndarray:
+    """Moist air density (kg/m³); dry air where P <= e (as humidity_ratio)."""
+    t_kelvin = np.asarray(t_air, dtype=float) + 273.15
+    p_pa = np.asarray(pressure_hpa, dtype=float) * 100.0
+    # Vapour pressure back from the guarded mixing ratio (none where P <= e)
+    w = humidity_ratio(vp_actual, pressure_hpa) / 1000.0
+    e_pa = p_pa * w / (0.622 + w)
+    p_dry_pa = p_pa - e_pa
+
+    # density = (Pd / (Rd * T)) + (Pv / (Rv * T))
+    return (p_dry_pa / (R_DRY_AIR * t_kelvin)) + (e_pa / (R_WATER_VAPOR * t_kelvin))
+
+
+def enthalpy(
+    t_air: ArrayLike, rh: ArrayLike, pressure_hpa: ArrayLike = 1013.25
+) -> np.ndarray:
+    """Moist air enthalpy (kJ/kg); pressure in hPa."""
+    t_air = np.asarray(t_air, dtype=float)
+    vp_actual = vapor_pressure(t_air) * (np.asarray(rh, dtype=float) / 100.0)
+    # Lower pressure (altitude) means a higher W, in kg/kg
+    w = humidity_ratio(vp_actual, pressure_hpa) / 1000.0
+    # H = 1.006*T + W*(2501 + 1.86*T)
+    return (1.006 * t_air) + (w * (2501 + 1.86 * t_air))
+
+
+def humidex(t_air: ArrayLike, dew_point: ArrayLike) -> np.ndarray:
+    """Humidex (°C) from the dew point."""
+    # Humidex = T + 0.5555 * (e - 10), e from the dew point (inverse Magnus)
+    e = 6.11 * np.exp(
+        5417.7530 * ((1 / 273.16) - (1 / (273.15 + np.asarray(dew_point, dtype=float))))
+    )
+    return np.asarray(t_air, dtype=float) + 0.5555 * (e - 10)
+
+
+# ----------------------------------------------------------------------
+# Saturation vapour pressure formulations
+# ----------------------------------------------------------------------
+# Selected once per install (set_saturation_formula); every psychrometric
+# function goes through it. Each formulation has a pure Python version for
+# scalars and a NumPy version for arrays, in hPa.
+SVP_MAGNUS = "magnus"
+SVP_HYLAND_WEXLER = "hyland_wexler"
+SVP_FORMULAS = (SVP_MAGNUS, SVP_HYLAND_WEXLER)
+
+
+def svp_magnus(t_air: float) -> float:
+    """Magnus formula over water (the original formulation)."""
+    return 6.112 * math.exp((17.67 * t_air) / (t_air + 243.5))
+
+
+def svp_magnus_array(t_air: np.ndarray) -> np.ndarray:
+    return 6.112 * np.exp((17.67 * t_air) / (t_air + 243.5))
+
+
+# Hyland-Wexler (ASHRAE Fundamentals): over ice below 0 °C, over water above.
+# ln(p_ws [Pa]) = C1/T + C2 + C3*T + C4*T^2 + C5*T^3 (+ C6*T^4) + C7*ln(T)
+_HW_ICE = (-5.6745359e3, 6.3925247, -9.677843e-3, 6.2215701e-7, 2.0747825e-9, -9.484024e-13, 4.1635019)
+_HW_WATER = (-5.8002206e3, 1.3914993, -4.8640239e-2, 4.1764768e-5, -1.4452093e-8, 0.0, 6.5459673)
+
+
+def _hyland_wexler_ln(t_kelvin, coefficients, log):
+    c1, c2, c3, c4, c5, c6, c7 = coefficients
+    return (
+        c1 / t_kelvin
+        + c2
+        + t_kelvin * (c3 + t_kelvin * (c4 + t_kelvin * (c5 + t_kelvin * c6)))
+        + c7 * log(t_kelvin)
+    )
+
+
+def svp_hyland_wexler(t_air: float) -> float:
+    """Hyland-Wexler, ice phase below 0 °C (valid -100 to 200 °C)."""
+    t_kelvin = t_air + 273.15
+    coefficients = _HW_ICE if t_air < 0 else _HW_WATER
+    return math.exp(_hyland_wexler_ln(t_kelvin, coefficients, math.log)) / 100.0
+
+
+def svp_hyland_wexler_water(t_air: float) -> float:
+    return math.exp(_hyland_wexler_ln(t_air + 273.15, _HW_WATER, math.log)) / 100.0
+
+
+def svp_hyland_wexler_ice(t_air: float) -> float:
+    return math.exp(_hyland_wexler_ln(t_air + 273.15, _HW_ICE, math.log)) / 100.0
+
+
+def svp_hyland_wexler_array(t_air: np.ndarray) -> np.ndarray:
+    return np.where(
+        t_air < 0,
+        svp_hyland_wexler_ice_array(t_air),
+        svp_hyland_wexler_water_array(t_air),
+    )
+
+
+def svp_hyland_wexler_water_array(t_air: np.ndarray) -> np.ndarray:
+    """Hyland-Wexler over (supercooled) water at every temperature."""
+    return np.exp(_hyland_wexler_ln(t_air + 273.15, _HW_WATER, np.log)) / 100.0
+
+
+def svp_hyland_wexler_ice_array(t_air: np.ndarray) -> np.ndarray:
+    """Hyland-Wexler over ice at every temperature."""
+    return np.exp(_hyland_wexler_ln(t_air + 273.15, _HW_ICE, np.log)) / 100.0
+
+
+_SVP_IMPLEMENTATIONS = {
+    SVP_MAGNUS: (svp_magnus, svp_magnus_array),
+    SVP_HYLAND_WEXLER: (svp_hyland_wexler, svp_hyland_wexler_array),
+}
+_svp_formula = SVP_MAGNUS
+_svp_scalar, _svp_array = _SVP_IMPLEMENTATIONS[SVP_MAGNUS]
+
+
+def _magnus_inverse(vp, log):
+    x = log(vp / 6.112)
+    return 243.5 * x / (17.67 - x)
+
+
+def svp_magnus_inverse(vp: ArrayLike) -> np.ndarray:
+    """Temperature (°C) at which the Magnus formula gives vp (hPa)."""
+    return _magnus_inverse(np.asarray(vp, dtype=float), np.log)
+
+
+def _invert_svp(svp, vp, log, iterations: int = 4):
+    """
+    Temperature (°C) at which svp gives vp, by Newton's method on ln(svp)
+    from the Magnus inverse. ln(svp) is close to linear in T, so a few fixed
+    steps (with a central difference slope) reach float precision. Works on
+    floats (math.log, scalar svp) and arrays (np.log, array svp).
+    """
+    target = log(vp)
+    t = _magnus_inverse(vp, log)
+    for _ in range(iterations):
+        slope = (log(svp(t + 1e-3)) - log(svp(t - 1e-3))) / 2e-3
+        t = t - (log(svp(t)) - target) / slope
+    return t
+
+
+def _svp_inverse(vp: np.ndarray) -> np.ndarray:
+    """Dew point (°C) of vp (hPa) with the selected formulation over water."""
+    if _svp_formula == SVP_MAGNUS:
+        return _magnus_inverse(vp, np.log)
+    return _invert_svp(svp_hyland_wexler_water_array, vp, np.log)
+
+
+def _svp_inverse_scalar(vp: float) -> float:
+    if _svp_formula == SVP_MAGNUS:
+        return _magnus_inverse(vp, math.log)
+    return _invert_svp(svp_hyland_wexler_water, vp, math.log)
+
+
+def set_saturation_formula(formula: str) -> None:
+    """
+    Select the saturation vapour pressure formulation for the whole process.
+
+    Meant to be called once at startup, before any state is computed. Results
+    cached by callers must be keyed by saturation_formula() (PsychroState
+    records the formulation it was computed with).
+    """
+    global _svp_formula, _svp_scalar, _svp_array
+    try:
+        _svp_scalar, _svp_array = _SVP_IMPLEMENTATIONS[formula]
+    except KeyError:
+        raise ValueError(f"Unknown saturation formula: {formula}") from None
+    _svp_formula = formula
+
+
+def saturation_formula() -> str:
+    """The selected saturation vapour pressure formulation."""
+    return _svp_formula
+
+
+@dataclass(slots=True, frozen=True)
+class PsychroState:
+    """Psychrometric properties of one (T, RH, P) air sample."""
+
+    t_air: float
+    rh: float
+    pressure: float  # hPa
+    vp_sat: float  # hPa
+    vp_actual: float  # hPa
+    dew_point: float  # °C
+    frost_point: float  # °C
+    mixing_ratio: float  # g/kg
+    abs_humidity: float  # g/m³ (volumetric)
+    density: float  # kg/m³
+    enthalpy: float  # kJ/kg
+    humidex: float  # °C
+    formula: str  # saturation vapour pressure formulation used
+
+
+def psychro_state(t_air: float, rh: float, pressure: float = 1013.25) -> PsychroState:
+    """
+    Every psychrometric output of an air sample in one pass, sharing the
+    vapour pressures and the dew point instead of re-deriving them per output.
+
+    Scalar inputs give floats (pure Python, the per-room path); arrays give
+    a state of broadcast arrays.
+    """
+    formula = _svp_formula
+    if (
+        isinstance(t_air, (float, int))
+        and isinstance(rh, (float, int))
+        and isinstance(pressure, (float, int))
+    ):
+        return _psychro_state_scalar(t_air, rh, pressure, formula)
+    t = np.asarray(t_air, dtype=float)
+    p = np.asarray(pressure, dtype=float)
+    vp_sat = vapor_pressure(t)
+    vp_actual = vp_sat * (np.asarray(rh, dtype=float) / 100.0)
+    dp = dew_point(t, rh)
+    w = humidity_ratio(vp_actual, p)
+    values = (
+        vp_sat,
+        vp_actual,
+        dp,
+        frost_point(t, dp),
+        w,
+        absolute_humidity(t, vp_actual),
+        air_density(t, vp_actual, p),
+        (1.006 * t) + (w / 1000.0 * (2501 + 1.86 * t)),
+        humidex(t, dp),
+    )
+    if not np.ndim(vp_actual):
+        values = tuple(float(value) for value in values)
+    return PsychroState(t_air, rh, pressure, *values, formula)
+
+
+def _psychro_state_scalar(
+    t_air: float, rh: float, pressure: float, formula: str
+) -> PsychroState:
+    vp_sat = _svp_scalar(t_air)
+    vp_actual = vp_sat * (rh / 100.0)
+    dp = _svp_inverse_scalar(vp_actual) if rh > 0 else -50.0
+    w = Psychrometrics.calculate_humidity_ratio(vp_actual, pressure)
+    return PsychroState(
+        t_air,
+        rh,
+        pressure,
+        vp_sat,
+        vp_actual,
+        dp,
+        Psychrometrics.calculate_frost_point(t_air, dp),
+        w,
+        (1000.0 * vp_actual * 100.0) / (461.5 * (t_air + 273.15)),
+        Psychrometrics.calculate_air_density(t_air, vp_actual, pressure),
+        (1.006 * t_air) + (w / 1000.0 * (2501 + 1.86 * t_air)),
+        Psychrometrics.calculate_humidex(t_air, dp),
+        formula,
+    )
+
+
+# ----------------------------------------------------------------------
+# Outdoor conditions
+# ----------------------------------------------------------------------
+def apparent_temperature(
+    t_out: float, rh_out: float | None, wind_ms: float
+) -> float | None:
+    """
+    Calculates Apparent Temperature (AAT) using local sensors.
+    Formula covers both Wind Chill and Humidity effects.
+    AT = Ta + 0.33*e - 0.70*ws - 4.00
+    """
+    if rh_out is None:
+        return None  # Cannot calculate without humidity
+
+    vp_actual = Psychrometrics.calculate_vapor_pressure(t_out) * (rh_out / 100.0)
+    return t_out + (0.33 * vp_actual) - (0.70 * wind_ms) - 4.00
+
+
+def effective_outdoor_temp(t_out: float, t_app: float | None) -> tuple[float, bool]:
+    """
+    Use the lower of dry bulb and apparent temperature.
+    (Conservative for heating: Wind Chill matters.)
+    Returns: (t_out_eff, used_apparent)
+    """
+    if t_app is not None and t_app < t_out:
+        return t_app, True
+    return t_out, False
+
+
+# ----------------------------------------------------------------------
+# Solar Position
+# ----------------------------------------------------------------------
+# Elevation of the sun's centre at sunrise/sunset (refraction + solar radius)
+SUN_HORIZON_ELEVATION = -0.833
+
+
+@dataclass(slots=True, frozen=True)
+class SunPosition:
+    """Sun azimuth (degrees from north, clockwise) and apparent elevation."""
+
+    azimuth: float
+    elevation: float
+
+    @property
+    def above_horizon(self) -> bool:
+        return self.elevation > SUN_HORIZON_ELEVATION
+
+
+def _refraction(elevation: float) -> float:
+    """Atmospheric refraction correction (degrees) for a true elevation."""
+    if elevation > 85.0:
+        return 0.0
+    te = math.tan(math.radians(elevation))
+    if elevation > 5.0:
+        arcsec = 58.1 / te - 0.07 / te**3 + 0.000086 / te**5
+    elif elevation > -0.575:
+        e = elevation
+        arcsec = 1735.0 + e * (-518.2 + e * (103.4 + e * (-12.79 + e * 0.711)))
+    else:
+        arcsec = -20.774 / te
+    return arcsec / 3600.0
+
+
+def solar_position(when: datetime, latitude: float, longitude: float) -> SunPosition:
+    """
+    Analytical sun position (NOAA solar calculator, ~0.01° over 1800-2100).
+
+    Works for any timestamp, so past and future positions (replays,
+    forecasts) come from the same function. Naive datetimes are taken as UTC.
+    """
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    timestamp = when.timestamp()
+
+    # Julian century since J2000.0
+    jc = (timestamp / 86400.0 + 2440587.5 - 2451545.0) / 36525.0
+
+    mean_long = (280.46646 + jc * (36000.76983 + jc * 0.0003032)) % 360.0
+    mean_anom = math.radians(357.52911 + jc * (35999.05029 - 0.0001537 * jc))
+    ecc = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    eq_center = (
+        math.sin(mean_anom) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+        + math.sin(2 * mean_anom) * (0.019993 - 0.000101 * jc)
+        + math.sin(3 * mean_anom) * 0.000289
+    )
+    omega = math.radians(125.04 - 1934.136 * jc)
+    app_long = math.radians(mean_long + eq_center - 0.00569 - 0.00478 * math.sin(omega))
+    mean_obliq = 23.0 + (
+        26.0 + (21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))) / 60.0
+    ) / 60.0
+    obliq = math.radians(mean_obliq + 0.00256 * math.cos(omega))
+    declination = math.asin(math.sin(obliq) * math.sin(app_long))
+
+    # Equation of time (minutes)
+    y = math.tan(obliq / 2) ** 2
+    l0 = math.radians(mean_long)
+    eq_time = 4.0 * math.degrees(
+        y * math.sin(2 * l0)
+        - 2 * ecc * math.sin(mean_anom)
+        + 4 * ecc * y * math.sin(mean_anom) * math.cos(2 * l0)
+        - 0.5 * y * y * math.sin(4 * l0)
+        - 1.25 * ecc * ecc * math.sin(2 * mean_anom)
+    )
+
+    minutes_utc = (timestamp % 86400.0) / 60.0
+    true_solar_time = (minutes_utc + eq_time + 4.0 * longitude) % 1440.0
+    hour_angle = math.radians(true_solar_time / 4.0 - 180.0)
+
+    lat = math.radians(latitude)
+    cos_zenith = math.sin(lat) * math.sin(declination) + math.cos(lat) * math.cos(
+        declination
+    ) * math.cos(hour_angle)
+    elevation = 90.0 - math.degrees(math.acos(max(-1.0, min(1.0, cos_zenith))))
+
+    azimuth = (
+        math.degrees(
+            math.atan2(
+                math.sin(hour_angle),
+                math.cos(hour_angle) * math.sin(lat)
+                - math.tan(declination) * math.cos(lat),
+            )
+        )
+        + 180.0
+    ) % 360.0
+
+    return SunPosition(azimuth, elevation + _refraction(elevation))
+
+
+SOLAR_CONSTANT = 1361.0  # W/m², at 1 AU
+# Ground reflectance for the reflected part of the irradiance on tilted glazing
+GROUND_ALBEDO = 0.2
+
+
+@dataclass(frozen=True, slots=True)
+class Irradiance:
+    """Irradiance (W/m²): global horizontal, direct normal, diffuse horizontal."""
+
+    ghi: float
+    dni: float
+    dhi: float
+
+
+def daylight_factor(sun_elevation: float) -> float:
+    """0 below civil twilight (-6°), ramping to 1 at 60° elevation."""
+    return max(0.0, min(1.0, (sun_elevation + 6.0) / 66.0))
+
+
+def extraterrestrial_irradiance(day_of_year: int) -> float:
+    """Normal irradiance at the top of the atmosphere (Earth-sun distance correction)."""
+    return SOLAR_CONSTANT * (1.0 + 0.033 * math.cos(2.0 * math.pi * day_of_year / 365.0))
+
+
+def clear_sky_irradiance(
+    sun_elevation: float, day_of_year: int, altitude: float = 0.0
+) -> Irradiance:
+    """
+    Meinel clear-sky model with the Laue altitude correction.
+
+    DNI = E0 * ((1 - 0.14h) * 0.7^(AM^0.678) + 0.14h), h the site altitude in
+    km and AM the Kasten-Young air mass. The diffuse part follows the Liu-Jordan
+    transmittance relation tau_d = 0.271 - 0.294 * tau_b, tau_b = DNI / E0.
+    """
+    if sun_elevation <= 0.0:
+        return Irradiance(0.0, 0.0, 0.0)
+
+    zenith = 90.0 - sun_elevation
+    air_mass = 1.0 / (
+        math.cos(math.radians(zenith)) + 0.50572 * (96.07995 - zenith) ** -1.6364
+    )
+    e0 = extraterrestrial_irradiance(day_of_year)
+    h = max(0.0, altitude) / 1000.0
+    dni = e0 * ((1.0 - 0.14 * h) * 0.7 ** (air_mass**0.678) + 0.14 * h)
+    sin_el = math.sin(math.radians(sun_elevation))
+    dhi = max(0.0, e0 * sin_el * (0.271 - 0.294 * dni / e0))
+    return Irradiance(dni * sin_el + dhi, dni, dhi)
+
+
+def diffuse_fraction(ghi: float, sun_elevation: float, day_of_year: int) -> float:
+    """Erbs et al. (1982) diffuse share of global irradiance from the clearness index."""
+    sin_el = math.sin(math.radians(sun_elevation))
+    if ghi <= 0.0 or sin_el <= 0.0:
+        return 1.0
+    kt = ghi / (extraterrestrial_irradiance(day_of_year) * sin_el)
+    if kt <= 0.22:
+        return 1.0 - 0.09 * kt
+    if kt <= 0.80:
+        return 0.9511 - 0.1604 * kt + 4.388 * kt**2 - 16.638 * kt**3 + 12.336 * kt**4
+    return 0.165
+
+
+def split_irradiance(ghi: float, sun_elevation: float, day_of_year: int) -> Irradiance:
+    """
+    Direct normal and diffuse horizontal parts of a global irradiance
+    (measured, or clear-sky attenuated by clouds) with the Erbs model.
+    """
+    ghi = max(0.0, ghi)
+    sin_el = math.sin(math.radians(sun_elevation))
+    if ghi == 0.0 or sin_el <= 0.0:
+        return Irradiance(ghi, 0.0, ghi)
+    dhi = ghi * diffuse_fraction(ghi, sun_elevation, day_of_year)
+    # Low sun: the beam is capped at what reaches the top of the atmosphere
+    dni = min((ghi - dhi) / sin_el, extraterrestrial_irradiance(day_of_year))
+    return Irradiance(ghi, dni, dhi)
+
+
+def cloud_attenuation(cloud: float) -> float:
+    """Kasten-Czeplak cloud factor for global irradiance: 1 - 0.75 * N^3.4."""
+    fraction = max(0.0, min(1.0, cloud / 100.0))
+    return 1.0 - 0.75 * fraction**3.4
+
+
+def rain_multiplier(is_raining: bool) -> float:
+    return 0.4 if is_raining else 1.0
+
+
+def is_precipitation(condition: str | None) -> bool:
+    """Whether a weather condition string means rain, snow or hail."""
+    cond = condition.lower() if condition else ""
+    return any(x in cond for x in ["rain", "pour", "snow", "hail"])
+
+
+def estimate_radiation(clear_ghi: float, cloud: float, is_raining: bool) -> float:
+    """Global irradiance (W/m²): clear-sky GHI attenuated by clouds and rain."""
+    return max(0.0, clear_ghi * cloud_attenuation(cloud) * rain_multiplier(is_raining))
+
+
+@dataclass(frozen=True, slots=True)
+class GlazingElement:
+    """One window or skylight of a room."""
+
+    # Compass direction the glass faces (degrees, 0 = N, 90 = E)
+    azimuth: float
+    # Angle from horizontal (degrees, 90 = vertical window, 0 = flat skylight)
+    tilt: float = 90.0
+    # Glass area (m²), weights the element in the room's solar term
+    area: float = 1.0
+    # Shading entity of this element (None = the room's shading entity)
+    shading: str | None = None
+
+
+def surface_normal(azimuth: float, tilt: float) -> tuple[float, float, float]:
+    """Unit normal (east, north, up) of a surface facing azimuth, tilted from horizontal."""
+    az, tilt_rad = math.radians(azimuth), math.radians(tilt)
+    return (
+        math.sin(tilt_rad) * math.sin(az),
+        math.sin(tilt_rad) * math.cos(az),
+        math.cos(tilt_rad),
+    )
+
+
+def incidence_cosine(
+    normals: ArrayLike, sun_azimuth: ArrayLike, sun_elevation: ArrayLike
+) -> np.ndarray:
+    """
+    Cosine of the angle between the sun and unit surface normals (..., 3);
+    sun positions broadcast against normals[..., 0]. 0 when the sun is down,
+    behind the surface or unknown (NaN).
+    """
+    normals = np.asarray(normals, dtype=float)
+    az = np.radians(sun_azimuth)
+    el = np.radians(sun_elevation)
+    cos_el = np.cos(el)
+    cos_theta = (
+        normals[..., 0] * cos_el * np.sin(az)
+        + normals[..., 1] * cos_el * np.cos(az)
+        + normals[..., 2] * np.sin(el)
+    )
+    return np.where(np.isnan(cos_theta) | (el <= 0) | (cos_theta <= 0), 0.0, cos_theta)
+
+
+def plane_irradiance(
+    normals: ArrayLike,
+    sun_azimuth: ArrayLike,
+    sun_elevation: ArrayLike,
+    ghi: ArrayLike,
+    dni: ArrayLike,
+    dhi: ArrayLike,
+    albedo: float = GROUND_ALBEDO,
+) -> np.ndarray:
+    """
+    Irradiance (W/m²) on surfaces with unit normals (..., 3): the beam
+    projected with cos(theta), the isotropic sky diffuse DHI * (1 + cos tilt)/2
+    and the ground-reflected GHI * albedo * (1 - cos tilt)/2. Everything else
+    broadcasts against normals[..., 0].
+    """
+    normals = np.asarray(normals, dtype=float)
+    cos_tilt = normals[..., 2]
+    return (
+        np.asarray(dni, dtype=float)
+        * incidence_cosine(normals, sun_azimuth, sun_elevation)
+        + np.asarray(dhi, dtype=float) * (1.0 + cos_tilt) / 2.0
+        + np.asarray(ghi, dtype=float) * albedo * (1.0 - cos_tilt) / 2.0
+    )
+
+
+def surface_irradiance(
+    irradiance: Irradiance,
+    sun_azimuth: float | None,
+    sun_elevation: float | None,
+    azimuth: float,
+    tilt: float = 90.0,
+) -> float:
+    """plane_irradiance of one surface facing azimuth, tilted from horizontal."""
+    return float(
+        plane_irradiance(
+            surface_normal(azimuth, tilt),
+            np.nan if sun_azimuth is None else sun_azimuth,
+            np.nan if sun_elevation is None else sun_elevation,
+            irradiance.ghi,
+            irradiance.dni,
+            irradiance.dhi,
+        )
+    )
+
+
+# Cloud covers (%) the annual gain ratio of legacy_solar_gain_scale averages over
+_LEGACY_GAIN_CLOUDS = (0.0, 50.0, 90.0)
+
+
+def legacy_solar_gain_scale(orientation: float, latitude: float) -> float:
+    """
+    k_solar scale that keeps the annual solar gain of a vertical window facing
+    orientation unchanged from the previous model, where the solar term used
+    global horizontal radiation times an azimuth-only incidence (cosine of the
+    azimuth difference plus 0.1, only 0.1 beyond 90°) instead of the plane
+    irradiance. Averaged hourly over a year of clear, half and mostly cloudy
+    sky at latitude.
+    """
+    azimuths, elevations, ghi, dni, dhi = [], [], [], [], []
+    start = datetime(2025, 1, 1, 0, 30, tzinfo=timezone.utc).timestamp()
+    for hour in range(8760):
+        when = datetime.fromtimestamp(start + hour * 3600.0, timezone.utc)
+        sun = solar_position(when, latitude, 0.0)
+        if sun.elevation <= 0.0:
+            continue
+        day_of_year = when.timetuple().tm_yday
+        clear = clear_sky_irradiance(sun.elevation, day_of_year)
+        for cloud in _LEGACY_GAIN_CLOUDS:
+            irradiance = split_irradiance(
+                estimate_radiation(clear.ghi, cloud, False), sun.elevation, day_of_year
+            )
+            azimuths.append(sun.azimuth)
+            elevations.append(sun.elevation)
+            ghi.append(irradiance.ghi)
+            dni.append(irradiance.dni)
+            dhi.append(irradiance.dhi)
+
+    ghi = np.array(ghi)
+    diff = np.abs(np.array(azimuths) - orientation) % 360.0
+    diff = np.where(diff > 180.0, 360.0 - diff, diff)
+    incidence = np.where(
+        diff >= 90.0, 0.1, np.minimum(1.0, np.cos(np.radians(diff)) + 0.1)
+    )
+    plane = plane_irradiance(
+        surface_normal(orientation, 90.0), azimuths, elevations, ghi, dni, dhi
+    )
+    total = float(np.sum(plane))
+    return float(np.sum(ghi * incidence)) / total if total > 0.0 else 1.0
+
+
+# ----------------------------------------------------------------------
+# Mean Radiant Temperature
+# ----------------------------------------------------------------------
+def smoothing_tau(alpha: float, reference_step: float = ALPHA_REFERENCE_STEP) -> float:
+    """Time constant (s) of the exponential filter equivalent to alpha."""
+    if alpha >= 1.0:
+        return 0.0
+    if alpha <= 0.0:
+        return math.inf
+    return -reference_step / math.log(1.0 - alpha)
+
+
+def smoothing_weight_array(
+    alpha: ArrayLike, dt: ArrayLike, reference_step: float = ALPHA_REFERENCE_STEP
+) -> np.ndarray:
+    """
+    Weight of the new sample after dt seconds: 1 - exp(-dt / tau).
+
+    A NaN dt means one reference step, i.e. the plain EMA weight alpha.
+    """
+    alpha = np.asarray(alpha, dtype=float)
+    dt = np.asarray(dt, dtype=float)
+    return np.where(
+        np.isnan(dt),
+        alpha,
+        1.0 - (1.0 - alpha) ** (np.maximum(dt, 0.0) / reference_step),
+    )
+
+
+def smoothing_weight(
+    alpha: float, dt: float | None, reference_step: float = ALPHA_REFERENCE_STEP
+) -> float:
+    """smoothing_weight_array for one value; dt=None means one reference step."""
+    if dt is None:
+        return alpha
+    return 1.0 - (1.0 - alpha) ** (max(dt, 0.0) / reference_step)
+
+
+@dataclass(slots=True)
+class MRTParams:
+    """Per-room envelope factors (the number entities of a room)."""
+
+    f_out: float
+    f_win: float
+    k_loss: float
+    k_solar: float
+    # Smoothing per ALPHA_REFERENCE_STEP seconds (see smoothing_tau)
+    alpha: float = 0.3
+
+
+@dataclass(slots=True)
+class MRTInputs:
+    """One snapshot of the conditions the MRT model needs."""
+
+    t_air: float
+    t_out_eff: float
+    wind_ms: float = 0.0
+    # Irradiance on the glazing (W/m², plane_irradiance); the engine derives
+    # it from the outdoor irradiance, the sun position and the glazing
+    radiation: float = 0.0
+    shading: float = 1.0
+    radiant_boost: float = 0.0
+    v_air: float = STILL_AIR_LIMIT
+
+
+@dataclass(slots=True)
+class MRTResult:
+    """Intermediate terms and final values of one MRT evaluation."""
+
+    loss_term: float
+    solar_term: float
+    mrt_unclamped: float
+    mrt_clamped: float
+    wall_temp_est: float
+    mrt: float
+    operative: float
+
+
+def radiant_boost_step(
+    previous: float, t_air: float, surface_temp: float, view_factor: float,
+    alpha: float, heating: bool, dt: float | None = None,
+) -> float:
+    """Move the radiant boost towards its heating target over dt seconds."""
+    target_boost = (surface_temp - t_air) * view_factor if heating else 0.0
+    weight = smoothing_weight(alpha, dt)
+    return ((1.0 - weight) * previous) + (weight * target_boost)
+
+
+def estimated_wall_temp(t_air: float, t_out: float, k_loss: float) -> float:
+    """T_surf = T_air - (Delta_T * k_loss)"""
+    return t_air - ((t_air - t_out) * k_loss)
+
+
+def mrt_terms(
+    t_air: ArrayLike,
+    t_out_eff: ArrayLike,
+    wind_ms: ArrayLike,
+    radiation: ArrayLike,
+    gain: ArrayLike,
+    f_out: ArrayLike,
+    f_win: ArrayLike,
+    k_loss: ArrayLike,
+    k_solar: ArrayLike,
+    radiant_boost: ArrayLike,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The MRT model before smoothing, for any number of rooms or time steps;
+    radiation is the irradiance on the glazing and gain the share of it let
+    through by shading. Returns the loss and solar terms, the unclamped and
+    the clamped MRT.
+
+    Arguments are floats or NumPy arrays (which broadcast). With floats only,
+    the model runs in plain Python and returns floats (compute_mrt).
+    """
+    term_loss = (
+        k_loss
+        * (t_air - t_out_eff)
+        * (f_out + 1.5 * f_win)
+        * (1 + 0.02 * wind_ms)
+    )
+    term_solar = k_solar * (radiation / 400.0) * gain * f_win
+    mrt_calc = t_air - term_loss + term_solar + radiant_boost
+
+    # --- Clamping ---
+    if isinstance(mrt_calc, float):
+        maximum, minimum = max, min
+    else:
+        maximum, minimum = np.maximum, np.minimum
+    lower_dyn = maximum(t_out_eff + 2.0, t_air - 3.0)
+    upper_dyn = t_air + 4.0
+    mrt_clamped = maximum(lower_dyn, minimum(mrt_calc, upper_dyn))
+    return term_loss, term_solar, mrt_calc, mrt_clamped
+
+
+def smooth_mrt(
+    mrt_prev: ArrayLike, mrt_clamped: ArrayLike, alpha: ArrayLike, dt: ArrayLike
+) -> np.ndarray:
+    """
+    Smoothed MRT dt seconds after mrt_prev. A NaN mrt_prev is a first run
+    (the clamped value is taken as is), a NaN dt one reference step.
+    """
+    mrt_clamped = np.asarray(mrt_clamped, dtype=float)
+    mrt_prev = np.asarray(mrt_prev, dtype=float)
+    mrt_prev = np.where(np.isnan(mrt_prev), mrt_clamped, mrt_prev)
+    weight = smoothing_weight_array(alpha, dt)
+    return ((1.0 - weight) * mrt_prev) + (weight * mrt_clamped)
+
+
+def compute_mrt(
+    inputs: MRTInputs,
+    params: MRTParams,
+    mrt_prev: float | None = None,
+    dt: float | None = None,
+) -> MRTResult:
+    """
+    Evaluate the MRT model for one room, in plain Python (see evaluate_many
+    for batches; both run mrt_terms).
+
+    mrt_prev is the previous smoothed value (None on the first run) and dt the
+    seconds elapsed since it was computed (None = one reference step); the new
+    smoothed value is returned in MRTResult.mrt.
+    """
+    t_air = float(inputs.t_air)
+    t_out_eff = float(inputs.t_out_eff)
+    term_loss, term_solar, mrt_calc, mrt_clamped = mrt_terms(
+        t_air,
+        t_out_eff,
+        float(inputs.wind_ms),
+        float(inputs.radiation),
+        float(inputs.shading),
+        params.f_out,
+        params.f_win,
+        params.k_loss,
+        params.k_solar,
+        inputs.radiant_boost,
+    )
+
+    # --- Smoothing ---
+    if mrt_prev is None:
+        mrt_final = mrt_clamped
+    else:
+        weight = smoothing_weight(params.alpha, dt)
+        mrt_final = ((1.0 - weight) * mrt_prev) + (weight * mrt_clamped)
+
+    return MRTResult(
+        loss_term=term_loss,
+        solar_term=term_solar,
+        mrt_unclamped=mrt_calc,
+        mrt_clamped=mrt_clamped,
+        wall_temp_est=estimated_wall_temp(t_air, t_out_eff, params.k_loss),
+        mrt=mrt_final,
+        operative=operative_temperature(t_air, mrt_final, inputs.v_air),
+    )
+
+
+def evaluate_many(
+    inputs: Sequence[MRTInputs],
+    params: MRTParams | Sequence[MRTParams],
+    mrt_prev: Sequence[float | None] | None = None,
+    dt: float | None = None,
+) -> list[MRTResult]:
+    """
+    Evaluate the MRT model for a batch of snapshots in one vectorized pass,
+    with the same functions the integration's engine runs.
+
+    params is either one MRTParams shared by every snapshot (what-if sweeps on
+    one room) or one per snapshot (many rooms). mrt_prev optionally supplies
+    the previous smoothed value per snapshot; without it every snapshot is
+    treated as a first run. dt is the time step between the previous values
+    and this batch (None = one reference step).
+    """
+    count = len(inputs)
+    if isinstance(params, MRTParams):
+        params = [params] * count
+    if mrt_prev is None:
+        mrt_prev = [None] * count
+    if len(params) != count or len(mrt_prev) != count:
+        raise ValueError("inputs, params and mrt_prev must have the same length")
+    if count == 0:
+        return []
+
+    def column(values) -> np.ndarray:
+        return np.fromiter(values, dtype=float, count=count)
+
+    t_air = column(snapshot.t_air for snapshot in inputs)
+    t_out_eff = column(snapshot.t_out_eff for snapshot in inputs)
+    k_loss = column(room.k_loss for room in params)
+    term_loss, term_solar, mrt_calc, mrt_clamped = mrt_terms(
+        t_air,
+        t_out_eff,
+        column(snapshot.wind_ms for snapshot in inputs),
+        column(snapshot.radiation for snapshot in inputs),
+        column(snapshot.shading for snapshot in inputs),
+        column(room.f_out for room in params),
+        column(room.f_win for room in params),
+        k_loss,
+        column(room.k_solar for room in params),
+        column(snapshot.radiant_boost for snapshot in inputs),
+    )
+
+    # --- Smoothing ---
+    mrt_final = smooth_mrt(
+        column(np.nan if prev is None else prev for prev in mrt_prev),
+        mrt_clamped,
+        column(room.alpha for room in params),
+        np.nan if dt is None else dt,
+    )
+    operative = operative_temperature_array(
+        t_air, mrt_final, column(snapshot.v_air for snapshot in inputs)
+    )
+    wall_temp_est = estimated_wall_temp(t_air, t_out_eff, k_loss)
+
+    return [
+        MRTResult(
+            loss_term=float(term_loss[row]),
+            solar_term=float(term_solar[row]),
+            mrt_unclamped=float(mrt_calc[row]),
+            mrt_clamped=float(mrt_clamped[row]),
+            wall_temp_est=float(wall_temp_est[row]),
+            mrt=float(mrt_final[row]),
+            operative=float(operative[row]),
+        )
+        for row in range(count)
+    ]
+
+
+# ----------------------------------------------------------------------
+# Convection and Operative Temperature
+# ----------------------------------------------------------------------
+def convective_coefficient_array(v_air: ArrayLike) -> np.ndarray:
+    """ASHRAE simplified convective coefficient (mixed natural + forced convection)."""
+    v_air = np.maximum(0.0, np.asarray(v_air, dtype=float))
+    return np.where(
+        v_air <= STILL_AIR_LIMIT,
+        HC_NATURAL,
+        HC_NATURAL + HC_FORCED * v_air**HC_FORCED_EXPONENT,
+    )
+
+
+def convective_coefficient(v_air: float) -> float:
+    """Convective coefficient hc (W/m²K) at one air speed."""
+    if v_air <= STILL_AIR_LIMIT:
+        return HC_NATURAL
+    return HC_NATURAL + HC_FORCED * v_air**HC_FORCED_EXPONENT
+
+
+def radiant_weighting_array(v_air: ArrayLike) -> np.ndarray:
+    """
+    Calculates the Radiant Weighting factor (A) based on air speed (v_air)
+    using the simplified ASHRAE heat transfer coefficients (hc and hr).
+
+    The final formula is A = hr / (hc + hr).
+    """
+    return H_RADIATIVE / (convective_coefficient_array(v_air) + H_RADIATIVE)
+
+
+def radiant_weighting(v_air: float) -> float:
+    """Radiant weighting factor A at one air speed."""
+    return H_RADIATIVE / (convective_coefficient(v_air) + H_RADIATIVE)
+
+
+def operative_temperature_array(
+    t_air: ArrayLike, mrt: ArrayLike, v_air: ArrayLike
+) -> np.ndarray:
+    """T_op = (1 - A) * T_air + A * MRT"""
+    weight = radiant_weighting_array(v_air)
+    return ((1.0 - weight) * np.asarray(t_air, dtype=float)) + (weight * mrt)
+
+
+def operative_temperature(t_air: float, mrt: float, v_air: float) -> float:
+    """Operative temperature of one room."""
+    weight = radiant_weighting(v_air)
+    return ((1.0 - weight) * t_air) + (weight * mrt)
+
+
+def film_coefficient(v_air: float) -> float:
+    """
+    Calculate h_film = h_radiative + h_convective
+    Standard ASHRAE 55 / ISO 7730 models.
+    """
+    return H_RADIATIVE + convective_coefficient(v_air)
+
+
+# ----------------------------------------------------------------------
+# Envelope: Heat Flux and Mold Risk
+# ----------------------------------------------------------------------
+@dataclass(slots=True)
+class HeatLossResult:
+    """Wall heat flux (W/m²) and the total loss split by surface (W)."""
+
+    heat_flux_wall: float
+    loss_opaque: float
+    loss_window: float
+
+    @property
+    def total(self) -> float:
+        return self.loss_opaque + self.loss_window
+
+
+def heat_loss(
+    t_air: float, t_out: float, t_surface: float, v_air: float,
+    area_opaque: float, area_window: float, window_u: float,
+) -> HeatLossResult:
+    """Opaque wall flux via the film coefficient, windows via Q = U * A * dT."""
+    heat_flux_wall = max(0.0, film_coefficient(v_air) * (t_air - t_surface))
+    loss_window = window_u * area_window * max(0.0, t_air - t_out)
+    return HeatLossResult(heat_flux_wall, heat_flux_wall * area_opaque, loss_window)
+
+
+def surface_relative_humidity(
+    t_air: float, rh: float, t_surface: float, vp_room: float | None = None
+) -> float:
+    """
+    RH of the room air when it touches a surface at t_surface (0-100 %).
+    vp_room is the room's actual vapour pressure if already known.
+    """
+    if vp_room is None:
+        vp_room = Psychrometrics.calculate_vapor_pressure(t_air) * (rh / 100.0)
+    vp_sat_surface = Psychrometrics.calculate_vapor_pressure(t_surface)
+    if vp_sat_surface == 0:
+        return 100.0
+    return min(100.0, max(0.0, (vp_room / vp_sat_surface) * 100.0))
+
+
+def mold_wall_temp(t_air: float, t_out: float, k_loss: float) -> float:
+    """Coldest wall estimate for mold risk (no drop when it is warmer outside)."""
+    delta_t = t_air - t_out
+    return t_air - (delta_t * k_loss if delta_t > 0 else 0.0)
+
+
+# ----------------------------------------------------------------------
+# Mold Growth Index (VTT model, Hukka & Viitanen 1999, Ojanen et al. 2010)
+# ----------------------------------------------------------------------
+MOLD_VERY_SENSITIVE = "very_sensitive"
+MOLD_SENSITIVE = "sensitive"
+MOLD_MEDIUM_RESISTANT = "medium_resistant"
+MOLD_RESISTANT = "resistant"
+
+
+@dataclass(frozen=True, slots=True)
+class MoldSensitivity:
+    """Growth coefficients of one VTT material sensitivity class."""
+
+    k1_early: float  # growth rate multiplier while M < 1
+    k1_late: float  # ... and once M >= 1
+    a: float  # M_max = A + B*x - C*x^2, x = (RH_crit - RH)/(RH_crit - 100)
+    b: float
+    c: float
+    rh_min: float  # lowest critical RH (%)
+
+
+MOLD_SENSITIVITY_CLASSES = {
+    # Pine sapwood
+    MOLD_VERY_SENSITIVE: MoldSensitivity(1.0, 2.0, 1.0, 7.0, 2.0, 80.0),
+    # Planed wood, paper-coated boards, wood-based panels
+    MOLD_SENSITIVE: MoldSensitivity(0.578, 0.386, 0.3, 6.0, 1.0, 80.0),
+    # Cement or plastic based materials, mineral fibres
+    MOLD_MEDIUM_RESISTANT: MoldSensitivity(0.072, 0.097, 0.0, 5.0, 1.5, 85.0),
+    # Glass and metal, alkaline materials
+    MOLD_RESISTANT: MoldSensitivity(0.033, 0.014, 0.0, 3.0, 1.0, 85.0),
+}
+MOLD_INDEX_MAX = 6.0
+# Decline per hour of unfavourable conditions: during the first 6 h, and after
+# 24 h (nothing in between), for wood
+MOLD_DECLINE_EARLY = 0.00133
+MOLD_DECLINE_LATE = 0.000667
+
+
+def mold_critical_rh(t_surface: float, sensitivity: MoldSensitivity) -> float:
+    """RH (%) above which mold grows at this surface temperature."""
+    if t_surface > 20.0:
+        return sensitivity.rh_min
+    rh_crit = (
+        -0.00267 * t_surface**3 + 0.160 * t_surface**2 - 3.13 * t_surface + 100.0
+    )
+    return max(rh_crit, sensitivity.rh_min)
+
+
+def _mold_decline(hours: float) -> float:
+    """Cumulative index decline after this many unfavourable hours."""
+    return MOLD_DECLINE_EARLY * min(hours, 6.0) + MOLD_DECLINE_LATE * max(
+        hours - 24.0, 0.0
+    )
+
+
+def mold_index_step(
+    index: float, unfavourable_hours: float, t_surface: float, rh_surface: float,
+    hours: float, sensitivity: MoldSensitivity,
+) -> tuple[float, float]:
+    """
+    Advance the VTT mold index (0-6) over `hours` of constant surface
+    conditions. Returns the new index and the length of the current
+    unfavourable (too dry or cold) period, which drives the decline.
+    """
+    if hours <= 0.0:
+        return index, unfavourable_hours
+    rh_crit = mold_critical_rh(t_surface, sensitivity)
+    if not (0.0 < t_surface < 50.0 and rh_surface >= rh_crit):
+        # Exact over the 6 h / 24 h decline phases however long the step is
+        elapsed = unfavourable_hours + hours
+        decline = _mold_decline(elapsed) - _mold_decline(unfavourable_hours)
+        return max(index - decline, 0.0), elapsed
+
+    # Growth; the exponent is the time (weeks) to reach M = 1 on pine
+    weeks = math.exp(
+        -0.68 * math.log(t_surface) - 13.9 * math.log(rh_surface) + 66.02
+    )
+    k1 = sensitivity.k1_early if index < 1.0 else sensitivity.k1_late
+    x = (rh_crit - rh_surface) / (rh_crit - 100.0) if rh_crit < 100.0 else 1.0
+    m_max = sensitivity.a + sensitivity.b * x - sensitivity.c * x * x
+    k2 = max(1.0 - math.exp(2.3 * (index - m_max)), 0.0)
+    growth = k1 * k2 / (7.0 * weeks) * (hours / 24.0)
+    return min(index + growth, MOLD_INDEX_MAX), 0.0
@@ -0,0 +1,127 @@
+"""Domain-wide state change index for Virtual MRT."""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable, Mapping
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DOMAIN, DATA_STATE_INDEX
+
+_LOGGER = logging.getLogger(__name__)
+
+# listener(entity_id, new_state, keys the subscriber registered for the entity)
+StateListener = Callable[[str, State | None, frozenset[str]], None]
+
+
+@callback
+def async_get_state_index(hass: HomeAssistant) -> StateChangeIndex:
+    """Return the index shared by every room and hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    index = domain_data.get(DATA_STATE_INDEX)
+    if index is None:
+        index = domain_data[DATA_STATE_INDEX] = StateChangeIndex(hass)
+    return index
+
+
+class StateChangeIndex:
+    """
+    Maps each source entity to the subscribers (rooms, outdoor hubs) it feeds.
+
+    Home Assistant sees one state change tracker per unique entity, however
+    many rooms use it. When the entity changes, every subscriber is called in
+    the same callback with the keys (model terms) it registered for that
+    entity, so all affected rooms are marked dirty in one pass and their MRT
+    submissions land in the same engine tick.
+
+    A subscriber may also declare, per entity, the attributes it reads. Events
+    that leave the state and all of those attributes unchanged (forecast
+    refreshes, current_temperature on a climate entity, ...) are dropped for
+    that subscriber before it is called.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._index: dict[
+            str,
+            dict[object, tuple[StateListener, frozenset[str], frozenset[str] | None]],
+        ] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+
+    @property
+    def entity_count(self) -> int:
+        return len(self._index)
+
+    @callback
+    def async_subscribe(
+        self,
+        entity_keys: Mapping[str, frozenset[str]],
+        listener: StateListener,
+        entity_attributes: Mapping[str, frozenset[str]] | None = None,
+    ) -> CALLBACK_TYPE:
+        """
+        Subscribe listener to the given entities. Returns the remover.
+
+        Entities listed in entity_attributes only call the listener when their
+        state or one of the given attributes changes; the others on any event.
+        """
+        entity_attributes = entity_attributes or {}
+        token = object()
+        entity_ids = list(entity_keys)
+        for entity_id in entity_ids:
+            subscribers = self._index.get(entity_id)
+            if subscribers is None:
+                subscribers = self._index[entity_id] = {}
+                self._unsubs[entity_id] = async_track_state_change_event(
+                    self.hass, [entity_id], self._async_dispatch
+                )
+            subscribers[token] = (
+                listener,
+                entity_keys[entity_id],
+                entity_attributes.get(entity_id),
+            )
+
+        @callback
+        def unsubscribe() -> None:
+            for entity_id in entity_ids:
+                subscribers = self._index.get(entity_id)
+                if subscribers is None:
+                    continue
+                subscribers.pop(token, None)
+                if not subscribers:
+                    del self._index[entity_id]
+                    self._unsubs.pop(entity_id)()
+
+        return unsubscribe
+
+    @callback
+    def _async_dispatch(self, event) -> None:
+        """Hand one state change to every subscriber of the entity."""
+        entity_id = event.data["entity_id"]
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        for listener, keys, attributes in list(self._index.get(entity_id, {}).values()):
+            if attributes is not None and not _relevant_change(
+                old_state, new_state, attributes
+            ):
+                continue
+            try:
+                listener(entity_id, new_state, keys)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error dispatching state change of %s", entity_id)
+
+
+def _relevant_change(
+    old_state: State | None, new_state: State | None, attributes: frozenset[str]
+) -> bool:
+    """Whether the state or any of the given attributes differ between the two."""
+    if old_state is None or new_state is None or old_state.state != new_state.state:
+        return True
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    return any(
+        old_attributes.get(attribute) != new_attributes.get(attribute)
+        for attribute in attributes
+    )
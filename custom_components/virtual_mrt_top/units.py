@@ -0,0 +1,229 @@
+"""Input parsing and unit normalization for Virtual MRT."""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    UnitOfIrradiance,
+    UnitOfPressure,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.unit_conversion import PressureConverter, SpeedConverter
+
+from .const import DOMAIN, DATA_STATE_PARSER
+
+_LOGGER = logging.getLogger(__name__)
+
+INVALID_STATES = ("unknown", "unavailable")
+
+# Physical quantities the model reads, and the SI unit it works in
+KIND_TEMPERATURE = "temperature"
+KIND_PRESSURE = "pressure"
+KIND_SPEED = "speed"
+KIND_IRRADIANCE = "irradiance"
+MODEL_UNITS = {
+    KIND_TEMPERATURE: UnitOfTemperature.CELSIUS,
+    KIND_PRESSURE: UnitOfPressure.HPA,
+    KIND_SPEED: UnitOfSpeed.METERS_PER_SECOND,
+    KIND_IRRADIANCE: UnitOfIrradiance.WATTS_PER_SQUARE_METER,
+}
+
+# Attributes the parser reads from a sensor besides its state
+SENSOR_ATTRIBUTES = frozenset({ATTR_UNIT_OF_MEASUREMENT})
+
+Converter = Callable[[float], float]
+
+_TEMPERATURE_CONVERTERS: dict[str, Converter] = {
+    UnitOfTemperature.FAHRENHEIT: lambda value: (value - 32.0) * 5.0 / 9.0,
+    UnitOfTemperature.KELVIN: lambda value: value - 273.15,
+}
+# Irradiance units Home Assistant has no converter for -> W/m²
+_IRRADIANCE_FACTORS = {
+    UnitOfIrradiance.BTUS_PER_HOUR_SQUARE_FOOT: 3.154591,
+    "W/ft²": 10.763910,
+    "kW/m²": 1000.0,
+}
+# Decimals kept after a conversion, so converted readings are as clean as
+# native ones (71.6 °F -> 22.0 °C, not 21.999999999999996)
+_CONVERTED_DIGITS = {
+    KIND_TEMPERATURE: 2,
+    KIND_PRESSURE: 2,
+    KIND_SPEED: 3,
+    KIND_IRRADIANCE: 1,
+}
+
+
+def float_state(state: State | None, default=None):
+    if not state or state.state in INVALID_STATES:
+        return default
+    try:
+        return float(state.state)
+    except ValueError:
+        return default
+
+
+def float_attr(state: State | None, attr: str, default=None):
+    if not state:
+        return default
+    val = state.attributes.get(attr)
+    try:
+        return float(val) if val is not None else default
+    except ValueError:
+        return default
+
+
+def get_converter(kind: str, unit: str | None) -> Converter | None:
+    """
+    Return the function converting a value in unit to the model unit, rounded
+    to _CONVERTED_DIGITS.
+
+    None means no conversion: the value is already in the model unit, carries
+    no unit, or the unit is not recognised (logged).
+    """
+    if not unit or unit == MODEL_UNITS[kind]:
+        return None
+
+    digits = _CONVERTED_DIGITS[kind]
+    factor: float | None = None
+    if kind == KIND_TEMPERATURE:
+        converter = _TEMPERATURE_CONVERTERS.get(unit)
+        if converter is not None:
+            return lambda value: round(converter(value), digits)
+    elif kind == KIND_IRRADIANCE:
+        factor = _IRRADIANCE_FACTORS.get(unit)
+    else:
+        unit_converter = PressureConverter if kind == KIND_PRESSURE else SpeedConverter
+        try:
+            # Both converters are linear, so one multiplication is enough
+            factor = unit_converter.convert(1.0, unit, MODEL_UNITS[kind])
+        except HomeAssistantError:
+            factor = None
+
+    if factor is None:
+        _LOGGER.warning(
+            "Unsupported %s unit '%s', using the value as %s",
+            kind,
+            unit,
+            MODEL_UNITS[kind],
+        )
+        return None
+    return lambda value: round(value * factor, digits)
+
+
+class UnitNormalizer:
+    """
+    Per-entity unit converters.
+
+    The converter for each entity (or entity attribute) is looked up once and
+    kept until the reported unit changes, so a conversion is a dict lookup, a
+    string comparison and at most one arithmetic expression. An unsupported
+    unit is logged once per entity, not on every read.
+    """
+
+    def __init__(self) -> None:
+        self._converters: dict[tuple[str, str], tuple[str | None, Converter | None]] = {}
+
+    def _converter(
+        self, entity_id: str, key: str, kind: str, unit: str | None
+    ) -> Converter | None:
+        cached = self._converters.get((entity_id, key))
+        if cached is not None and cached[0] == unit:
+            return cached[1]
+        converter = get_converter(kind, unit)
+        self._converters[(entity_id, key)] = (unit, converter)
+        return converter
+
+    def convert(
+        self, entity_id: str, key: str, kind: str, unit: str | None, value: float
+    ) -> float:
+        """value of entity_id's state (key "") or attribute key, in the model unit."""
+        converter = self._converter(entity_id, key, kind, unit)
+        return converter(value) if converter else value
+
+
+@callback
+def async_get_state_parser(hass: HomeAssistant) -> StateParser:
+    """Return the parser shared by every room and hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    parser = domain_data.get(DATA_STATE_PARSER)
+    if parser is None:
+        parser = domain_data[DATA_STATE_PARSER] = StateParser()
+    return parser
+
+
+class StateParser:
+    """
+    Domain-wide cache of numeric values parsed from State objects.
+
+    State objects are immutable and replaced on every change, so the values
+    read from one (its state and the attributes we use, already converted to
+    model units) are cached against the object itself. Each state update is
+    then parsed once, however many rooms, hubs and attributes read it. Units
+    are converted by a UnitNormalizer, which keeps each entity's converter
+    across state objects.
+    """
+
+    def __init__(self) -> None:
+        self._units = UnitNormalizer()
+        # entity_id -> (state object the values belong to, values)
+        self._entries: dict[str, tuple[State, dict[tuple[str, str | None], float | None]]] = {}
+
+    def _values(self, state: State) -> dict[tuple[str, str | None], float | None]:
+        entry = self._entries.get(state.entity_id)
+        if entry is None or entry[0] is not state:
+            entry = self._entries[state.entity_id] = (state, {})
+        return entry[1]
+
+    def state(self, state: State | None, kind: str | None = None, default=None):
+        """The state as a float (in the model unit of kind, if given)."""
+        if state is None:
+            return default
+        values = self._values(state)
+        key = ("", kind)
+        if key in values:
+            value = values[key]
+        else:
+            value = float_state(state)
+            if value is not None and kind is not None:
+                value = self._units.convert(
+                    state.entity_id,
+                    "",
+                    kind,
+                    state.attributes.get(ATTR_UNIT_OF_MEASUREMENT),
+                    value,
+                )
+            values[key] = value
+        return default if value is None else value
+
+    def attr(
+        self,
+        state: State | None,
+        attr: str,
+        unit_attr: str | None = None,
+        kind: str | None = None,
+        default=None,
+    ):
+        """
+        An attribute as a float. With kind, it is converted from the unit named
+        by the unit_attr attribute (weather entities).
+        """
+        if state is None:
+            return default
+        values = self._values(state)
+        key = (attr, kind)
+        if key in values:
+            value = values[key]
+        else:
+            value = float_attr(state, attr)
+            if value is not None and kind is not None and unit_attr:
+                value = self._units.convert(
+                    state.entity_id, attr, kind, state.attributes.get(unit_attr), value
+                )
+            values[key] = value
+        return default if value is None else value
@@ -0,0 +1,87 @@
+"""
+Saturation vapour pressure: accuracy and speed of the formulations.
+
+Compares Hyland-Wexler against the Magnus formula, for scalar calls (pure
+Python, used by the integration) and for NumPy arrays (offline/bulk use). physics.py is loaded on its own, so only
+NumPy is needed:
+
+    python scripts/benchmark_vapor_pressure.py
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import pathlib
+import sys
+import timeit
+
+import numpy as np
+
+PHYSICS = (
+    pathlib.Path(__file__).resolve().parent.parent
+    / "custom_components"
+    / "virtual_mrt_top"
+    / "physics.py"
+)
+# Temperature range compared (°C)
+T_MIN = -40.0
+T_MAX = 60.0
+
+
+def load_physics():
+    spec = importlib.util.spec_from_file_location("physics", PHYSICS)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["physics"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def ns_per_call(func, arg, number: int = 200_000) -> float:
+    best = min(timeit.repeat(lambda: func(arg), number=number, repeat=5))
+    return best / number * 1e9
+
+
+def main() -> None:
+    physics = load_physics()
+    formulas = {
+        "magnus": (physics.svp_magnus, physics.svp_magnus_array),
+        "hyland_wexler": (physics.svp_hyland_wexler, physics.svp_hyland_wexler_array),
+    }
+
+    grid = np.linspace(T_MIN, T_MAX, 1_000_001)
+    magnus = physics.svp_magnus_array(grid)
+    samples = np.random.default_rng(0).uniform(T_MIN, T_MAX, 1_000_000)
+
+    print(
+        f"Range {T_MIN:g} ... {T_MAX:g} °C, deviation from Magnus"
+        " (for Hyland-Wexler this is the Magnus error, largest over ice)"
+    )
+    header = f"{'formula':<15}{'max abs hPa':>14}{'max rel':>12}{'scalar ns':>12}{'array ns/el':>13}"
+    print(header)
+    print("-" * len(header))
+    for name, (scalar, array) in formulas.items():
+        values = array(grid)
+        abs_err = np.abs(values - magnus)
+        # The scalar and array versions must agree
+        spot = grid[::997]
+        drift = max(abs(scalar(float(t)) - float(v)) for t, v in zip(spot, array(spot)))
+        assert drift < 1e-9, f"{name}: scalar/array mismatch {drift}"
+
+        scalar_ns = ns_per_call(scalar, 21.3)
+        array_ns = (
+            min(timeit.repeat(lambda: array(samples), number=5, repeat=3))
+            / 5
+            / samples.size
+            * 1e9
+        )
+        print(
+            f"{name:<15}{abs_err.max():>14.2e}{(abs_err / magnus).max():>12.2e}"
+            f"{scalar_ns:>12.0f}{array_ns:>13.2f}"
+        )
+
+    wrapper_ns = ns_per_call(physics.vapor_pressure, 21.3, number=50_000)
+    print(f"\nphysics.vapor_pressure on a Python float (NumPy path): {wrapper_ns:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()